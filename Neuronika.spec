@@ -1,19 +1,69 @@
 # -*- mode: python ; coding: utf-8 -*-
+import argparse
+import subprocess
+import sys
 
+parser = argparse.ArgumentParser()
+parser.add_argument('--fast-start', action='store_true')
+options = parser.parse_args()
+
+QT_EXCLUDES = [
+    'PyQt6.QtNetwork',
+    'PyQt6.QtOpenGL',
+    'PyQt6.QtOpenGLWidgets',
+    'PyQt6.QtPdf',
+    'PyQt6.QtQml',
+    'PyQt6.QtQuick',
+    'PyQt6.QtSql',
+    'PyQt6.QtSvg',
+    'PyQt6.QtTest',
+    'PyQt6.QtWebEngineCore',
+    'PyQt6.QtWebEngineWidgets',
+    'PyQt6.QtXml',
+]
+STDLIB_EXCLUDES = ['tkinter', 'unittest', 'pydoc', 'doctest', 'lib2to3']
+QT_PLUGINS = {'platforms', 'imageformats', 'styles', 'multimedia'}
+QT_IMAGE_FORMATS = ('qico',)
+
+
+def keep_qt_file(dest):
+    parts = dest.replace('\\', '/').split('/')
+    if 'Qt6' not in parts:
+        return True
+    tail = parts[parts.index('Qt6') + 1:]
+    if tail[:1] == ['translations']:
+        return False
+    if tail[:1] != ['plugins'] or len(tail) < 3:
+        return True
+    if tail[1] not in QT_PLUGINS:
+        return False
+    return tail[1] != 'imageformats' or tail[2].startswith(QT_IMAGE_FORMATS)
+
+
+subprocess.run([sys.executable, 'main.py', '--build-assets'], check=True)
+subprocess.run([sys.executable, 'main.py', '--build-help'], check=True)
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[('icons', 'icons'), ('app.ico', '.')],
+    datas=[
+        ('icons.bundle', '.'),
+        ('help.bundle', '.'),
+        ('sounds', 'sounds'),
+        ('app.ico', '.'),
+    ],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=QT_EXCLUDES + STDLIB_EXCLUDES if options.fast_start else [],
     noarchive=False,
-    optimize=0,
+    optimize=2 if options.fast_start else 0,
 )
+if options.fast_start:
+    a.binaries = [entry for entry in a.binaries if keep_qt_file(entry[0])]
+    a.datas = [entry for entry in a.datas if keep_qt_file(entry[0])]
 pyz = PYZ(a.pure)
 
 exe = EXE(
@@ -25,7 +75,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=not options.fast_start,
     console=False,
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -39,7 +89,7 @@ coll = COLLECT(
     a.binaries,
     a.datas,
     strip=False,
-    upx=True,
+    upx=not options.fast_start,
     upx_exclude=[],
     name='Neuronika',
 )
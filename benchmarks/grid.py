@@ -0,0 +1,97 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import QApplication, QGridLayout, QLabel, QWidget
+
+import settings
+from main import QuestWindow
+from tools.grid import GridBoard
+from tools.pixmaps import PixmapCache
+
+SIZES = (3, 10, 20, 30)
+
+
+def layout(size: int) -> dict[tuple[int, int], str]:
+    files = [str(QuestWindow.base_dir / file_name) for file_name in settings.TRIAL_ICONS]
+    cells = itertools.product(range(size), repeat=2)
+    return {cell: files[i % len(files)] for i, cell in enumerate(cells) if i % 2 == 0}
+
+
+def build_labels(size: int, cells: dict, pixmaps: PixmapCache) -> QWidget:
+    board = QWidget()
+    board.setLayout(QGridLayout())
+    board.layout().setSpacing(0)
+    cell = QuestWindow.board_size / size
+    side = min(cell.width(), cell.height()) - GridBoard.padding * 2
+    for y, x in itertools.product(range(size), repeat=2):
+        icon = QLabel()
+        file_name = cells.get((y, x))
+        if file_name:
+            icon.setPixmap(pixmaps.pixmap(file_name, side))
+        icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        icon.setStyleSheet("border: 1px solid black")
+        icon.setFixedSize(cell)
+        board.layout().addWidget(icon, y, x)
+    return board
+
+
+def build_grid(size: int, cells: dict, pixmaps: PixmapCache) -> QWidget:
+    board = GridBoard(size, QuestWindow.board_size, pixmaps)
+    board.set_cells(cells)
+    return board
+
+
+def measure(build, size: int, repeat: int) -> dict:
+    app = QApplication.instance()
+    pixmaps = PixmapCache(settings.PIXMAP_CACHE_LIMIT)
+    cells = layout(size)
+    build(size, cells, pixmaps)
+    builds, paints = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        board = build(size, cells, pixmaps)
+        board.show()
+        app.processEvents()
+        builds.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        board.grab()
+        paints.append(time.perf_counter() - start)
+        board.close()
+        board.deleteLater()
+        app.processEvents()
+    return {"build_ms": min(builds) * 1000, "paint_ms": min(paints) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="QuestWindow board build/paint time")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    results = {}
+    for size in SIZES:
+        results[size] = {
+            "labels": measure(build_labels, size, args.repeat),
+            "grid": measure(build_grid, size, args.repeat),
+        }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'size':>5}  {'renderer':<8}  {'build ms':>9}  {'paint ms':>9}")
+    for size, renderers in results.items():
+        for name, result in renderers.items():
+            build_ms, paint_ms = result["build_ms"], result["paint_ms"]
+            print(f"{size:>5}  {name:<8}  {build_ms:>9.2f}  {paint_ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEvent, QEventLoop, QObject, Qt, QTimer, QVariantAnimation
+from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import (
+    QApplication,
+    QGraphicsPixmapItem,
+    QGraphicsScene,
+    QGraphicsView,
+    QGridLayout,
+    QWidget,
+)
+
+from main import MainBlock, MainIcon
+
+
+class PaintCounter(QObject):
+    def __init__(self):
+        super().__init__()
+        self.paints = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self.paints += 1
+        return False
+
+
+class LegacyIcon(QGraphicsView):
+    def __init__(self, file_name: str):
+        super().__init__()
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.scene = QGraphicsScene()
+        self.setScene(self.scene)
+        self.filename = str(MainIcon.base_dir / file_name)
+        self.pixmap_item = QGraphicsPixmapItem()
+        self.scene.addItem(self.pixmap_item)
+        self.pixmap_item.setPixmap(
+            QIcon(self.filename).pixmap(MainIcon.start_size, MainIcon.start_size)
+        )
+        self.animation = QVariantAnimation()
+        self.animation.setDuration(MainIcon.animation_duration)
+        self.animation.valueChanged.connect(self.update_pixmap)
+
+    def update_pixmap(self, value):
+        pixmap = QIcon(self.filename).pixmap(int(value), int(value))
+        pixmap = pixmap.scaled(
+            int(value),
+            int(value),
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+        self.pixmap_item.setPixmap(pixmap)
+        self.pixmap_item.setPos(-value / 2, -value / 2)
+
+    def hover(self, entered: bool):
+        sizes = MainIcon.start_size, MainIcon.end_size
+        self.animation.setStartValue(sizes[not entered])
+        self.animation.setEndValue(sizes[entered])
+        self.animation.start()
+
+
+def build_legacy():
+    block = QWidget()
+    block.setLayout(QGridLayout())
+    icons = []
+    for column, buttons_column in enumerate(MainBlock.buttons_data):
+        for row, (file_name, _) in enumerate(buttons_column):
+            icon = LegacyIcon(file_name)
+            block.layout().addWidget(icon, row, column)
+            icons.append(icon)
+    return block, [icon.viewport() for icon in icons], [icon.hover for icon in icons]
+
+
+def build_scene():
+    block = MainBlock()
+    icons = [item for item in block.scene.items() if isinstance(item, MainIcon)]
+
+    def hover(icon):
+        scales = icon.start_size / icon.end_size, 1.0
+        return lambda entered: block.animator.animate(icon, scales[entered])
+
+    return block, [block.buttons_widget.viewport()], [hover(icon) for icon in icons]
+
+
+def spin(seconds: float):
+    loop = QEventLoop()
+    QTimer.singleShot(round(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def measure(build, rounds: int) -> dict:
+    block, viewports, hovers = build()
+    block.resize(1200, 500)
+    block.show()
+    spin(0.2)
+    counter = PaintCounter()
+    for viewport in viewports:
+        viewport.installEventFilter(counter)
+
+    settle = MainIcon.animation_duration / 1000 + 0.05
+    wall = cpu = 0.0
+    for _ in range(rounds):
+        for hover in hovers:
+            for entered in (True, False):
+                wall_start, cpu_start = time.perf_counter(), time.process_time()
+                hover(entered)
+                spin(settle)
+                wall += time.perf_counter() - wall_start
+                cpu += time.process_time() - cpu_start
+    block.close()
+    hovers_count = rounds * len(hovers) * 2
+    return {
+        "widgets": len(block.findChildren(QWidget)) + 1,
+        "views": len(viewports),
+        "fps": counter.paints / wall,
+        "cpu_ms_per_hover": cpu * 1000 / hovers_count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MainBlock hover animation cost")
+    parser.add_argument("--rounds", type=int, default=2)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    results = {
+        "per-view": measure(build_legacy, args.rounds),
+        "scene": measure(build_scene, args.rounds),
+    }
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'driver':<9}  {'widgets':>7}  {'views':>5}  {'fps':>6}  {'cpu ms/hover':>12}")
+    for name, result in results.items():
+        print(
+            f"{name:<9}  {result['widgets']:>7}  {result['views']:>5}  "
+            f"{result['fps']:>6.1f}  {result['cpu_ms_per_hover']:>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+EXECUTABLE = "Neuronika.exe" if sys.platform == "win32" else "Neuronika"
+BUILDS = {
+    "source": [sys.executable, str(ROOT / "main.py")],
+    "default": [str(ROOT / "dist" / "Neuronika" / EXECUTABLE)],
+    "fast": [str(ROOT / "dist" / "fast" / "Neuronika" / EXECUTABLE)],
+}
+
+
+def evict(directory: Path) -> bool:
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    for path in directory.rglob("*"):
+        if not path.is_file():
+            continue
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
+    return True
+
+
+def launch(command: list[str], timeout: float) -> float:
+    with tempfile.TemporaryDirectory() as directory:
+        probe = Path(directory, "probe")
+        started = time.time_ns()
+        subprocess.run(
+            [*command, "--launch-probe", str(probe)],
+            check=True,
+            timeout=timeout,
+            capture_output=True,
+            env={**os.environ, "HOME": directory, "USERPROFILE": directory},
+        )
+        return (int(probe.read_text()) - started) / 1e6
+
+
+def measure(command: list[str], runs: int, timeout: float) -> dict:
+    evicted = evict(Path(command[-1]).parent)
+    cold = launch(command, timeout)
+    warm = [launch(command, timeout) for _ in range(runs)]
+    return {
+        "cold_ms": cold,
+        "cold_evicted": evicted,
+        "warm_ms": statistics.median(warm),
+        "warm_min_ms": min(warm),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Launch-to-first-frame time of the source tree and frozen builds"
+    )
+    parser.add_argument("builds", nargs="*", metavar="BUILD", help=", ".join(BUILDS))
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.builds or BUILDS:
+        command = BUILDS.get(name)
+        if command is None:
+            parser.error(f"unknown build {name!r}")
+        if not Path(command[-1]).exists():
+            print(f"{name}: {command[-1]} not found, skipping", file=sys.stderr)
+            continue
+        results[name] = measure(command, args.runs, args.timeout)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'build':<8} {'cold ms':>10} {'warm ms':>10} {'best ms':>10}")
+    for name, result in results.items():
+        cold = f"{result['cold_ms']:.1f}" + ("" if result["cold_evicted"] else "*")
+        print(
+            f"{name:<8} {cold:>10} {result['warm_ms']:>10.1f}"
+            f" {result['warm_min_ms']:>10.1f}"
+        )
+    if not all(result["cold_evicted"] for result in results.values()):
+        print("* page cache could not be dropped, cold is the first launch only")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEvent, QObject, QSize
+from PyQt6.QtWidgets import QApplication, QWidget
+
+import settings
+
+DATA_DIR = tempfile.TemporaryDirectory(
+    prefix="neuronika-bench-", ignore_cleanup_errors=True
+)
+USER_DIR = settings.DATA_DIR
+for name, value in vars(settings).copy().items():
+    if isinstance(value, Path) and value.is_relative_to(USER_DIR):
+        setattr(settings, name, Path(DATA_DIR.name, value.relative_to(USER_DIR)))
+
+import main as neuronika
+from tools import PasswordManager
+
+PAGES = {
+    "login": neuronika.LoginWindow,
+    "menu": neuronika.MenuWindow,
+    "quest": neuronika.QuestWindow,
+}
+
+
+class PaintWatcher(QObject):
+    def __init__(self):
+        super().__init__()
+        self.painted = False
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            self.painted = True
+        return False
+
+
+def peak_rss_kb() -> int:
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        ctypes.windll.psapi.GetProcessMemoryInfo(
+            ctypes.windll.kernel32.GetCurrentProcess(),
+            ctypes.byref(counters),
+            counters.cb,
+        )
+        return counters.PeakWorkingSetSize // 1024
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def timed(func, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench_construction(repeat: int) -> dict:
+    results = {}
+    for name, factory in PAGES.items():
+        factory()
+        results[f"construct.{name}_ms"] = timed(factory, repeat)
+    return results
+
+
+def bench_switch(app: QApplication, repeat: int) -> dict:
+    results = {}
+    for name in PAGES:
+        neuronika.ROUTER.page(name)
+    for name in PAGES:
+        samples = []
+        for _ in range(repeat):
+            neuronika.ROUTER.show("login" if name != "login" else "menu")
+            app.processEvents()
+            watcher = PaintWatcher()
+            page = neuronika.ROUTER.page(name)
+            page.installEventFilter(watcher)
+            start = time.perf_counter()
+            neuronika.ROUTER.show(name)
+            while not watcher.painted:
+                app.processEvents()
+            samples.append((time.perf_counter() - start) * 1000)
+            page.removeEventFilter(watcher)
+        results[f"switch.{name}_ms"] = statistics.median(samples)
+    return results
+
+
+def bench_hover(app: QApplication, repeat: int) -> dict:
+    neuronika.ROUTER.show("menu")
+    app.processEvents()
+    block = neuronika.ROUTER.page("menu").findChild(neuronika.MainBlock)
+    icons = [item for item in block.scene.items() if isinstance(item, neuronika.MainIcon)]
+    viewport = block.buttons_widget.viewport()
+    samples = []
+    for index in range(repeat):
+        scale = 1.0 if index % 2 == 0 else icons[0].start_size / icons[0].end_size
+        for icon in icons:
+            block.animator.animate(icon, scale)
+        while block.animator.running:
+            start = time.perf_counter()
+            block.animator.tick()
+            viewport.repaint()
+            samples.append((time.perf_counter() - start) * 1000)
+            time.sleep(block.animator.interval / 1000)
+    return {"hover.frame_ms": statistics.median(samples)}
+
+
+def bench_widgets() -> dict:
+    return {
+        f"widgets.{name}": len(neuronika.ROUTER.page(name).findChildren(QWidget)) + 1
+        for name in PAGES
+    }
+
+
+def bench_resize(app: QApplication, window: QWidget, repeat: int) -> dict:
+    results = {}
+    steps = [*range(1, repeat + 1), *range(repeat - 1, -1, -1)]
+    for name in PAGES:
+        neuronika.ROUTER.show(name)
+        app.processEvents()
+        page = neuronika.ROUTER.page(name)
+        samples = []
+        for step in steps:
+            watcher = PaintWatcher()
+            page.installEventFilter(watcher)
+            start = time.perf_counter()
+            window.resize(QSize(1280 + step * 16, 800 + step * 10))
+            while not watcher.painted:
+                app.processEvents()
+            samples.append((time.perf_counter() - start) * 1000)
+            page.removeEventFilter(watcher)
+        results[f"resize.{name}_ms"] = statistics.median(samples)
+    return results
+
+
+def bench_help(repeat: int) -> dict:
+    from tools.help import HelpIndex, build_help
+
+    path = Path(DATA_DIR.name, settings.HELP_BUNDLE)
+    build_help(path, Path(neuronika.BASEDIR, settings.HELP_DIR))
+    index = HelpIndex(path)
+    queries = [
+        query[:length]
+        for query in ("упражнения", "память", "изображений расположение", "вход")
+        for length in range(1, len(query) + 1)
+    ]
+    return {
+        "help.load_ms": timed(lambda: HelpIndex(path), repeat),
+        "help.search_ms": timed(
+            lambda: [index.search(query, settings.HELP_RESULTS) for query in queries],
+            repeat,
+        )
+        / len(queries),
+    }
+
+
+def bench_verify(repeat: int) -> dict:
+    PasswordManager.load_rounds(settings.HASH_COST_FILE)
+    neuronika.USERS.add("benchmark", "benchmark")
+    return {
+        "login.verify_ms": timed(
+            lambda: neuronika.USERS.authenticate("benchmark", "benchmark"),
+            max(3, repeat // 4),
+        )
+    }
+
+
+def bench_rss() -> dict:
+    results = {}
+    for name in ("idle", *PAGES):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.suite", "--rss-page", name],
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).resolve().parent.parent,
+        ).stdout
+        results[f"rss.{name}_kb"] = json.loads(output.splitlines()[-1])
+    return results
+
+
+def rss_page(app: QApplication, name: str):
+    if name != "idle":
+        page = PAGES[name]()
+        page.resize(1280, 800)
+        page.show()
+        app.processEvents()
+        page.grab()
+    print(json.dumps(peak_rss_kb()))
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    regressions = []
+    for metric, value in sorted(results.items()):
+        before = baseline.get(metric)
+        if not before:
+            continue
+        change = (value - before) / before
+        if change > threshold:
+            regressions.append(f"{metric}: {before:.2f} -> {value:.2f} (+{change:.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Neuronika UI benchmark suite")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--save", type=Path, metavar="BASELINE")
+    parser.add_argument("--compare", type=Path, metavar="BASELINE")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--rss-page", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    with DATA_DIR:
+        run(args)
+
+
+def run(args: argparse.Namespace):
+    app = QApplication(sys.argv)
+    if args.rss_page:
+        rss_page(app, args.rss_page)
+        return
+
+    window = neuronika.MainWindow()
+    window.resize(1280, 800)
+    window.show()
+    app.processEvents()
+    neuronika.SESSION.login = settings.LOGIN
+
+    results = {}
+    results.update(bench_construction(args.repeat))
+    results.update(bench_switch(app, args.repeat))
+    results.update(bench_hover(app, args.repeat))
+    results.update(bench_widgets())
+    results.update(bench_resize(app, window, args.repeat))
+    results.update(bench_help(args.repeat))
+    results.update(bench_verify(args.repeat))
+    results.update(bench_rss())
+    neuronika.PRESENTER.cancel()
+    neuronika.RESULTS.close()
+
+    width = max(map(len, results))
+    for metric, value in results.items():
+        print(f"{metric:<{width}}  {value:>10.2f}")
+
+    if args.save is not None:
+        args.save.write_text(json.dumps(results, indent=2, sort_keys=True))
+    if args.compare is not None:
+        regressions = compare(
+            results, json.loads(args.compare.read_text()), args.threshold
+        )
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,17 @@
+from tools.tracing import TRACER, TRACE_FLAG
+
+import argparse
+import json
+import logging
+import secrets
 import sys
-import webbrowser
-from collections.abc import Callable
+import tempfile
+import time
+from collections import deque
 from pathlib import Path
-from os.path import dirname, join
+from os.path import dirname
 
-from PyQt6.QtCore import Qt, QVariantAnimation, QSize
+from PyQt6.QtCore import Qt, QRect, QSize, QTimer, QEvent
 from PyQt6.QtWidgets import (
     QApplication,
     QMainWindow,
@@ -16,19 +23,110 @@ from PyQt6.QtWidgets import (
     QSizePolicy,
     QLineEdit,
     QStackedLayout,
-    QTextEdit,
-    QGridLayout,
     QGraphicsPixmapItem,
+    QGraphicsTextItem,
     QGraphicsView,
     QGraphicsScene, QSpacerItem,
+    QProgressBar,
+    QGridLayout,
+)
+from PyQt6.QtGui import (
+    QFont,
+    QFontMetrics,
+    QIcon,
+    QCursor,
+    QColor,
+    QImage,
+    QPainter,
+    QPixmap,
 )
-from PyQt6.QtGui import QPalette, QImage, QBrush, QPixmap, QIcon, QCursor
 
 import settings
 from tools import PasswordManager
+from tools.analytics import DifficultyController, StatsCache, accuracy
+from tools.animation import ScaleAnimator
+from tools.assets import AssetBundle, build_bundle
+from tools.audio import SINKS, AudioEngine, create_sink
+from tools.chrome import ButtonStrip, InfoCard, StripButton, TiledBackground
+from tools.grid import GridBoard
+from tools.pixmaps import PixmapCache
+from tools.presentation import Exposure, PresentationScheduler
+from tools.recording import (
+    PAGE,
+    STIMULUS,
+    TRIAL,
+    SessionRecorder,
+    SessionReplayer,
+    read_session,
+    session_path,
+)
+from tools.results import ResultStore, Trial
+from tools.router import PageRouter
+from tools.session import Session
+from tools.shared import SharedImageCache
+from tools.startup import after_first_paint, after_idle, warm_imports
+from tools.tasks import run_in_background
+from tools.theme import THEMES, Theme
+from tools.timing import NO_STIMULUS, InputClock
+from tools.trials import Layout, Level, TrialPool
+from tools.users import UserStore
 
-STACK = QStackedLayout()
 BASEDIR = dirname(__file__)
+STACK = QStackedLayout()
+BUNDLE = AssetBundle.open(Path(BASEDIR, settings.ASSET_BUNDLE), BASEDIR)
+PIXMAPS = PixmapCache(
+    settings.PIXMAP_CACHE_LIMIT,
+    BUNDLE,
+    SharedImageCache.open(
+        settings.SHARED_IMAGE_CACHE_FILE,
+        settings.SHARED_IMAGE_CACHE_SIZE,
+        settings.SHARED_IMAGE_CACHE_SLOTS,
+        BUNDLE,
+    )
+    if settings.SHARED_IMAGE_CACHE
+    else None,
+)
+ROUTER = PageRouter(
+    STACK,
+    settings.PAGE_IDLE_TIMEOUT,
+    settings.PAGE_MEMORY_LIMIT,
+    settings.PAGE_PREFETCH_DELAY,
+    settings.PAGE_SWEEP_INTERVAL,
+    PIXMAPS,
+)
+USERS = UserStore(
+    settings.USERS_FILE,
+    {settings.LOGIN: settings.PASSWORD},
+    legacy=settings.CREDENTIALS_FILE,
+)
+RESULTS = ResultStore(
+    settings.RESULTS_FILE, settings.RESULTS_BATCH_SIZE, settings.RESULTS_FLUSH_INTERVAL
+)
+SESSION = Session(level=settings.TRIAL_LEVEL, exposure_ms=settings.EXPOSURE_MS)
+STATS = StatsCache(RESULTS.stats, settings.TRIAL_LEVEL)
+DIFFICULTY = DifficultyController(
+    len(settings.TRIAL_LEVELS),
+    settings.DIFFICULTY_RAISE_AT,
+    settings.DIFFICULTY_LOWER_AT,
+    settings.DIFFICULTY_MIN_TRIALS,
+)
+TRIALS = TrialPool(
+    settings.TRIAL_ICONS,
+    [Level(*level) for level in settings.TRIAL_LEVELS],
+    secrets.randbits(32) if settings.TRIAL_SEED is None else settings.TRIAL_SEED,
+    settings.TRIAL_POOL_SIZE,
+    settings.TRIAL_HISTORY,
+    settings.TRIAL_MAX_OVERLAP,
+    settings.TRIAL_BATCH,
+)
+REPLAY_LAYOUTS: deque[Layout] = deque()
+INPUT_CLOCK = InputClock(settings.INPUT_HISTORY)
+PRESENTER = PresentationScheduler(settings.EXPOSURE_DROP_TOLERANCE)
+AUDIO = AudioEngine(create_sink(settings.AUDIO_SINK, settings.AUDIO_WAV_FILE))
+AUDIO_LOADS = {}
+RECORDER = SessionRecorder(settings.RECORD_COMPRESS, settings.RECORD_FLUSH_INTERVAL)
+THEME = Theme(settings.THEME)
+LOGGER = logging.getLogger("neuronika.app")
 
 try:
     from ctypes import windll
@@ -55,7 +153,15 @@ class Input(QVBoxLayout):
     def value(self):
         return self._input.text()
 
+    @property
+    def edited(self):
+        return self._input.textEdited
+
+    def clear(self):
+        self._input.clear()
+
 
+@TRACER.traced
 class LoginWindow(QWidget):
     error_mgs = "Неверный логин или пароль"
     login_text = "Логин:"
@@ -76,238 +182,222 @@ class LoginWindow(QWidget):
         self.enter = QPushButton(self.button_text)
         self.enter.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
         self.enter.clicked.connect(self._login_process)
+        self.password_input.edited.connect(lambda: ROUTER.prefetch("menu"))
+        self.busy = QProgressBar()
+        self.busy.setRange(0, 0)
+        self.busy.setTextVisible(False)
+        self.busy.setFixedHeight(5)
+        self.busy.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+        self.busy.hide()
 
         self.layout.addWidget(self.error_span)
         self.layout.addLayout(self.login_input)
         self.layout.addLayout(self.password_input)
         self.layout.addWidget(self.enter)
+        self.layout.addWidget(self.busy)
         self.layout.addStretch(1)
 
     def _login_process(self):
-        if PasswordManager.verify(self.password_input.value, settings.PASSWORD):
-            STACK.setCurrentIndex(1)
-        else:
-            self.error_span.show()
-
-
-class TopPanelArea(QWidget):
-    def __init__(self, height, color):
-        super().__init__()
-        self.wrapper = QWidget()
-        self.wrapper.setLayout(QHBoxLayout())
-        self.wrapper.setStyleSheet(f"background-color: {color}; color: white;")
-
-        self.setFixedHeight(height)
-        self.wrapper.layout().addWidget(self)
-        self.wrapper.layout().setContentsMargins(0, 0, 0, 0)
-
-
-class UserNameWidget(QWidget):
-    user_header = "ПОЛЬЗОВАТЕЛЬ:"
-    user_name_color = "#8c7c44"
+        if not self.enter.isEnabled():
+            return
+        self.enter.setEnabled(False)
+        self.error_span.hide()
+        self.busy.show()
+        login = self.login_input.value.strip()
+        run_in_background(
+            USERS.authenticate,
+            login,
+            self.password_input.value,
+            on_finished=lambda verified: self._login_result(login, verified),
+            on_failed=lambda error: self._login_result(login, False),
+        )
 
-    def __init__(self):
-        super().__init__()
-        self.layout = QVBoxLayout()
-        self.setLayout(self.layout)
-        self.layout.setSpacing(0)
-        self.layout.setContentsMargins(0, 0, 0, 0)
-        self.user_name_header = QLabel(self.user_header)
-        self.user_name_header.setAlignment(Qt.AlignmentFlag.AlignBottom)
-        self.layout.addWidget(self.user_name_header)
-        self.user_name = QLabel(settings.LOGIN)
-        self.user_name.setStyleSheet(f"color: {self.user_name_color}")
-        self.user_name.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.layout.addWidget(self.user_name)
+    def _login_result(self, login: str, verified: bool):
+        self.busy.hide()
+        self.enter.setEnabled(True)
+        if not verified:
+            self.error_span.show()
+            return
+        SESSION.login = login
+        self.clear()
+        ROUTER.show("menu")
+
+    def clear(self):
+        self.login_input.clear()
+        self.password_input.clear()
+        self.error_span.hide()
 
 
-class TopPanelButtons(QWidget):
+@TRACER.traced
+class TopPanelButtons(ButtonStrip):
+    size = 25
+    base_dir = Path(BASEDIR, "icons", "main_top_panel", "buttons")
     buttons_data = (
         ("list.png", "упражнения", None),
-        (
-            "question.png",
-            "помощь",
-            lambda: webbrowser.open(
-                "https://developer.mozilla.org/en-US/docs/Learn/HTML/Introduction_to_HTML/Creating_hyperlinks"
-            ),
-        ),
-        ("info.png", "о программе", lambda: webbrowser.open(
-                "https://www.pythonguis.com/pyqt6-tutorial/"
-            )),
-        ("exit.png", "выход", lambda: STACK.setCurrentIndex(0)),
+        ("question.png", "помощь", lambda: open_help("index")),
+        ("info.png", "о программе", lambda: open_help("about")),
+        ("exit.png", "выход", lambda: logout()),
     )
 
     def __init__(self):
-        super().__init__()
-        self.layout = QHBoxLayout()
-        self.setLayout(self.layout)
-        self.layout.setAlignment(Qt.AlignmentFlag.AlignRight)
-        self.layout.setSpacing(0)
-        self.layout.setContentsMargins(0, 0, 0, 0)
-
-        for button_data in self.buttons_data:
-            filename, text, func = button_data
-            button = QWidget()
-            icon = TopPanelButton(filename, func)
-            text_widget = QLabel(text)
-            text_widget.setAlignment(Qt.AlignmentFlag.AlignTop)
-            button_layout = QVBoxLayout()
-            button.setLayout(button_layout)
-
-            button_layout.addWidget(icon)
-            button_layout.addWidget(text_widget)
-            self.layout.addWidget(button)
-
-
-class TopPanelButton(QLabel):
-    size = 25
-    base_dir = Path(BASEDIR, "icons", "main_top_panel", "buttons")
-
-    def __init__(self, file_name: str, func: Callable | None = None):
-        super().__init__()
-        self.func = func
-
-        self.setPixmap(
-            QPixmap(str(self.base_dir / file_name)).scaled(self.size, self.size)
+        super().__init__(
+            [
+                StripButton(
+                    PIXMAPS.image(
+                        str(self.base_dir / file_name), self.size, keep_aspect=False
+                    ),
+                    text,
+                    func,
+                )
+                for file_name, text, func in self.buttons_data
+            ],
+            THEME,
+            "panel_text_color",
         )
-        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-
-    def mousePressEvent(self, ev):
-        if self.func is not None:
-            self.func()
+        self.setObjectName("TopPanelButtons")
 
 
+@TRACER.traced
 class TopPanel(QWidget):
-    height = 1
+    margin = 11
+    spacing = 6
     base_dir = Path(BASEDIR, "icons", "main_top_panel")
     logo_file_path = str(base_dir / "logo.png")
     user_file_path = str(base_dir / "user.png")
+    logo_size = 50
+    user_size = 20
     header = "КОГНИТИВНАЯ РЕАБИЛИТАЦИЯ"
-    left_panel_color = "#446c7c"
-    right_panel_color = "#365b66"
+    header_font_size = 23
+    user_header = "ПОЛЬЗОВАТЕЛЬ:"
 
     def __init__(self):
         super().__init__()
-        self.layout = QHBoxLayout()
-        self.layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.setObjectName("TopPanel")
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-        self.layout.setSpacing(0)
-        self.layout.setContentsMargins(0, 0, 0, 0)
-        self.setLayout(self.layout)
-
-        self.left_panel = TopPanelArea(self.height, self.left_panel_color).wrapper
-        self.left_panel.layout().setAlignment(Qt.AlignmentFlag.AlignLeft)
-        self.logo = QLabel()
-        self.logo.setPixmap(QPixmap(self.logo_file_path).scaled(50, 50))
-        self.header = QLabel(self.header)
-        self.header.setStyleSheet("font-size: 23px;")
-        self.left_panel.layout().addWidget(self.logo)
-        self.left_panel.layout().addWidget(self.header)
-
-        self.right_panel = TopPanelArea(self.height, self.right_panel_color).wrapper
-        self.right_panel.layout().setAlignment(Qt.AlignmentFlag.AlignRight)
-
-        self.user_area = QWidget()
-        self.user_area.setLayout(QHBoxLayout())
-        self.user_area.layout().setAlignment(Qt.AlignmentFlag.AlignLeft)
-        self.user_img = QLabel()
-        self.user_img.setPixmap(QPixmap(self.user_file_path).scaled(20, 20))
-        self.user_name = UserNameWidget()
-        self.user_area.layout().addWidget(self.user_img)
-        self.user_area.layout().addWidget(self.user_name)
-
-        self.right_panel.layout().addWidget(self.user_area)
+        self.logo = PIXMAPS.image(
+            self.logo_file_path, self.logo_size, keep_aspect=False
+        )
+        self.user_img = PIXMAPS.image(
+            self.user_file_path, self.user_size, keep_aspect=False
+        )
+        self.header_font = QFont(self.font())
+        self.header_font.setPixelSize(self.header_font_size)
+        self.left_width = (
+            2 * self.margin
+            + self.logo_size
+            + self.spacing
+            + QFontMetrics(self.header_font).horizontalAdvance(self.header)
+        )
 
-        self.button_area = QWidget()
-        self.button_area.setLayout(QHBoxLayout())
-        self.button_area.layout().setAlignment(Qt.AlignmentFlag.AlignRight)
-        self.button_area.layout().addWidget(TopPanelButtons())
-        self.button_area.layout().setContentsMargins(0, 0, 0, 0)
-        self.right_panel.layout().addStretch()
-        self.right_panel.layout().addWidget(self.button_area)
+        self.buttons = TopPanelButtons()
+        self.setLayout(QHBoxLayout())
+        self.layout().setContentsMargins(0, 0, self.margin, 0)
+        self.layout().addStretch()
+        self.layout().addWidget(self.buttons)
+        self.setFixedHeight(
+            max(self.logo_size + 2 * self.margin, self.buttons.sizeHint().height())
+        )
+        THEME.changed.connect(self.update)
+
+    def cached_pixmaps(self) -> list[QImage]:
+        return [self.logo, self.user_img]
+
+    def showEvent(self, event):
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        height = self.height()
+        split = max(self.width() // 3, self.left_width)
+        painter.fillRect(0, 0, split, height, QColor(THEME.color("left_panel_color")))
+        painter.fillRect(
+            split,
+            0,
+            self.width() - split,
+            height,
+            QColor(THEME.color("right_panel_color")),
+        )
+        painter.setPen(QColor(THEME.color("panel_text_color")))
+
+        x = self.margin
+        logo_width = round(self.logo.deviceIndependentSize().width())
+        logo_height = round(self.logo.deviceIndependentSize().height())
+        painter.drawImage(x, (height - logo_height) // 2, self.logo)
+        x += logo_width + self.spacing
+        painter.setFont(self.header_font)
+        painter.drawText(
+            QRect(x, 0, max(0, split - x), height),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            self.header,
+        )
 
-        self.layout.addWidget(self.left_panel, stretch=1)
-        self.layout.addWidget(self.right_panel, stretch=2)
+        x = split + self.margin
+        user_height = round(self.user_img.deviceIndependentSize().height())
+        painter.drawImage(x, (height - user_height) // 2, self.user_img)
+        x += round(self.user_img.deviceIndependentSize().width()) + self.spacing
+        painter.setFont(self.font())
+        text_width = max(0, self.buttons.x() - x)
+        painter.drawText(
+            QRect(x, 0, text_width, height // 2),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignBottom,
+            self.user_header,
+        )
+        painter.setPen(QColor(THEME.color("user_name_color")))
+        painter.drawText(
+            QRect(x, height // 2, text_width, height - height // 2),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop,
+            SESSION.login,
+        )
+        painter.end()
 
 
-class MainIcon(QGraphicsView):
+@TRACER.traced
+class MainIcon(QGraphicsPixmapItem):
     animation_duration = 200
     start_size = 120
     end_size = round(start_size * 1.1)
     base_dir = Path(BASEDIR, "icons", "main_quests")
 
-    def __init__(self, file_name: str):
-        super().__init__()
-        self.setStyleSheet("border: none")
-        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        
-        self.scene = QGraphicsScene()
-        self.setScene(self.scene)
-
-        self.filename = str(self.base_dir / file_name)
-
-        self.pixmap_item = QGraphicsPixmapItem()
-        self.scene.addItem(self.pixmap_item)
-        pixmap = QIcon(self.filename).pixmap(self.start_size, self.start_size)
-        self.pixmap_item.setPixmap(pixmap)
-        
-        self.animation = QVariantAnimation()
-        self.animation.setDuration(self.animation_duration)
-        self.animation.valueChanged.connect(lambda value: self.update_pixmap(value))
-        self.animation.setStartValue(self.start_size)
-        self.animation.setEndValue(self.end_size)
-
-        self.pixmap_item.setPos(-self.start_size / 2, -self.start_size / 2)
-        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+    def __init__(self, file_name: str, label: str, animator: ScaleAnimator):
+        super().__init__(PIXMAPS.pixmap(str(self.base_dir / file_name), self.end_size))
+        self.category = " ".join(label.split())
+        self.animator = animator
+        self.setTransformationMode(Qt.TransformationMode.SmoothTransformation)
+        self.setShapeMode(QGraphicsPixmapItem.ShapeMode.BoundingRectShape)
+        self.setTransformOriginPoint(self.boundingRect().center())
+        self.setScale(self.start_size / self.end_size)
+        self.setAcceptHoverEvents(True)
         self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
 
-    def update_pixmap(self, value):
-        pixmap = QIcon(self.filename).pixmap(int(value), int(value))
-        pixmap_scaled = pixmap.scaled(int(value), int(value), Qt.AspectRatioMode.KeepAspectRatio,
-                                      Qt.TransformationMode.SmoothTransformation)
-        self.pixmap_item.setPixmap(pixmap_scaled)
-        self.pixmap_item.setPos(-value / 2, -value / 2)
+        self.label = QGraphicsTextItem()
+        self.label.setPlainText(label)
+        self.label.setDefaultTextColor(QColor(THEME.color("label_color")))
+        option = self.label.document().defaultTextOption()
+        option.setAlignment(Qt.AlignmentFlag.AlignHCenter)
+        self.label.document().setDefaultTextOption(option)
+
+    def place(self, x: float, y: float, width: float):
+        rect = self.boundingRect()
+        self.setPos(
+            x + (width - rect.width()) / 2, y + (self.end_size - rect.height()) / 2
+        )
+        self.label.setTextWidth(width)
+        self.label.setPos(x, y + self.end_size)
 
-    def enterEvent(self, event):
-        self.animation.setStartValue(self.start_size)
-        self.animation.setEndValue(self.end_size)
-        self.animation.start()
+    def hoverEnterEvent(self, event):
+        self.animator.animate(self, 1.0)
 
-    def leaveEvent(self, event):
-        self.animation.setStartValue(self.end_size)
-        self.animation.setEndValue(self.start_size)
-        self.animation.start()
+    def hoverLeaveEvent(self, event):
+        self.animator.animate(self, self.start_size / self.end_size)
 
     def mousePressEvent(self, ev):
-        STACK.setCurrentIndex(2)
-
-
-class MainButton(QWidget):
-    color = "#bfaca3"
-
-    def __init__(self, file_name: str, label: str):
-        super().__init__()
-        self.layout = QVBoxLayout()
-        self.setLayout(self.layout)
-        self.layout.setSpacing(0)
-        self.layout.setContentsMargins(0, 0, 0, 0)
-        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-
-        self.button_header = QLabel(label)
-        self.button_header.setAlignment(
-            Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignHCenter
-        )
-        self.button_header.setStyleSheet(f"color: {self.color}")
-
-        self.icon = MainIcon(file_name)
-        self.icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        self.layout.addWidget(self.icon)
-        self.layout.addWidget(self.button_header)
+        SESSION.category = self.category
+        prepare_audio(self.category)
+        ROUTER.show("quest")
 
 
+@TRACER.traced
 class MainBlock(QWidget):
     buttons_data = (
         (
@@ -331,6 +421,8 @@ class MainBlock(QWidget):
             ("dialog.PNG", "Языковые навыки\nи словарный запас"),
         ),
     )
+    tile_width = 220
+    tile_height = 210
 
     def __init__(self):
         super().__init__()
@@ -338,29 +430,46 @@ class MainBlock(QWidget):
         self.layout().setAlignment(Qt.AlignmentFlag.AlignTop)
         self.layout().setSpacing(0)
         self.layout().setContentsMargins(0, 0, 0, 0)
-        self.setStyleSheet("background-color: white")
+        self.setObjectName("MainBlock")
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         
-        self.buttons_widget = QWidget()
-        self.buttons_widget.setLayout(QHBoxLayout())
-        self.layout().setAlignment(Qt.AlignmentFlag.AlignTop)
-        
-        for buttons_column in self.buttons_data:
-            column = QWidget()
-            column_layout = QVBoxLayout()
-            column.setLayout(column_layout)
-            for button_data in buttons_column:
-                button = MainButton(*button_data)
-                column_layout.addWidget(button)
-            self.buttons_widget.layout().addWidget(column)
-        
-        self.info_widget = InfoBlock().wrapper
+        self.animator = ScaleAnimator(MainIcon.animation_duration)
+        self.scene = QGraphicsScene()
+        for column, buttons_column in enumerate(self.buttons_data):
+            for row, (file_name, label) in enumerate(buttons_column):
+                icon = MainIcon(file_name, label, self.animator)
+                x, y = column * self.tile_width, row * self.tile_height
+                icon.place(x, y, self.tile_width)
+                self.scene.addItem(icon)
+                self.scene.addItem(icon.label)
+
+        self.buttons_widget = QGraphicsView(self.scene)
+        self.buttons_widget.setObjectName("MenuTiles")
+        self.buttons_widget.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        self.buttons_widget.setHorizontalScrollBarPolicy(
+            Qt.ScrollBarPolicy.ScrollBarAlwaysOff
+        )
+        self.buttons_widget.setVerticalScrollBarPolicy(
+            Qt.ScrollBarPolicy.ScrollBarAlwaysOff
+        )
+        self.buttons_widget.setFixedHeight(self.tile_height * 2)
+        self.buttons_widget.setAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        self.info_widget = InfoBlock()
         
         self.layout().addWidget(self.buttons_widget)
         self.layout().addWidget(self.info_widget)
+        THEME.changed.connect(self._update_labels)
 
+    def _update_labels(self):
+        color = QColor(THEME.color("label_color"))
+        for item in self.scene.items():
+            if isinstance(item, MainIcon):
+                item.label.setDefaultTextColor(color)
 
-class InfoBlock(QWidget):
+
+@TRACER.traced
+class InfoBlock(InfoCard):
     info_header = "ДОБРО ПОЖАЛОВАТЬ"
     info = (
         "Программа когнитивной реабилитации позволяет снизить, восстановить и максимально возможно улучшить степень когнитивного "
@@ -369,72 +478,53 @@ class InfoBlock(QWidget):
         "на помощь пациентам в развитии построения стратегии для решения сложных задач. Методика основана на стандартных и "
         "специализированных упражнениях, которые состоят из интерактивных интересных заданий."
     )
-    background_color = "#ececf4"
+    text_width = 1000
 
     def __init__(self):
-        super().__init__()
-        self.wrapper = QWidget()
-        self.wrapper.setLayout(QVBoxLayout())
-        self.wrapper.setStyleSheet("background-color: white")
-        
-        self.setLayout(QVBoxLayout())
-        self.setStyleSheet(
-            f"padding: 10px; border-radius: 3px; border: 1px solid {TopPanel.left_panel_color}; background-color: {self.background_color}"
-        )
-        
-        self.text = QTextEdit()
-        self.text.setFixedSize(1000, 150)
-        self.text.setStyleSheet("padding: 10px")
-        self.text.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.text.setReadOnly(True)
-        self.text.setHtml(
-            """
-                <p>{}</p>
-                <p>{}</p>
-            """.format(
-                self.info_header, self.info
-            )
+        super().__init__(
+            "<p>{}</p><p>{}</p>".format(self.info_header, self.info),
+            self.text_width,
+            THEME,
+            "left_panel_color",
+            "info_background_color",
         )
-        
-        h_layout = QHBoxLayout()
-        h_layout.addStretch(1)
-        h_layout.addWidget(self.text)
-        h_layout.addStretch(1)
-        
-        self.layout().addLayout(h_layout)
-        self.wrapper.layout().addWidget(self)
+        self.setObjectName("InfoCard")
 
 
+@TRACER.traced
 class Texture(QWidget):
     texture_file_path = str(Path(BASEDIR, "icons", "texture.jpg").resolve())
     header = "ГРУППЫ УПРАЖНЕНИЙ"
-    header_color = TopPanel.left_panel_color
 
     def __init__(self):
         super().__init__()
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
-
-        self.setAutoFillBackground(True)
-        palette = QPalette()
-        palette.setBrush(
-            QPalette.ColorRole.Window, QBrush(QImage(self.texture_file_path))
-        )
-        self.setPalette(palette)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.background = TiledBackground(PIXMAPS.pixmap(self.texture_file_path))
         self.setSizePolicy(
             QSizePolicy.Policy.Expanding,
             QSizePolicy.Policy.Expanding,
         )
 
         self.header_widget = QLabel(self.header)
-        self.header_widget.setStyleSheet(
-            f"font-size: 25px; color: {self.header_color}; font-weight 500;"
-        )
+        self.header_widget.setObjectName("TextureHeader")
         self.header_widget.setContentsMargins(0, 30, 0, 0)
         self.layout.addWidget(self.header_widget, alignment=Qt.AlignmentFlag.AlignTop)
         self.layout.addWidget(MainBlock())
 
+    def cached_pixmaps(self) -> list[QPixmap]:
+        return self.background.cached()
 
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self.background.paint(
+            painter, event.rect(), self.size(), self.devicePixelRatio()
+        )
+        painter.end()
+
+
+@TRACER.traced
 class MenuWindow(QWidget):
     def __init__(self):
         super().__init__()
@@ -446,85 +536,234 @@ class MenuWindow(QWidget):
         self.layout.addWidget(Texture(), stretch=1)
 
 
+@TRACER.traced
 class QuestWindow(QWidget):
     header = "Запомните изображения и их расположение"
     button_text = "Продолжить"
     back_text = "Назад"
-    quest_size = 3
-    icons_data = {
-        (0, 0): "bag.PNG",
-        (1, 0): "canoe.PNG",
-        (1, 1): "atom.PNG",
-        (2, 0): "open_book.PNG",
-        (2, 2): "timer.PNG",
-    }
-    button_color = "#499477"
+    board_size = QSize(900, 450)
     base_dir = Path(BASEDIR, "icons", "main_quests", "generic")
     arrow_icon_path = str(Path(base_dir, "left-arrow.png").resolve())
+    arrow_size = 20
     
     def __init__(self):
         super().__init__()
-        self.setLayout(QVBoxLayout())
+        self.setObjectName("QuestPanel")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
+        self.setLayout(QGridLayout())
         self.header = QLabel(self.header)
         self.header.setAlignment(Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignBottom)
-        self.layout().addWidget(self.header)
-        self.layout().setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        self.quest_content = QWidget()
-        self.quest_content.setLayout(QGridLayout())
-        self.quest_content.layout().setSpacing(0)
-        
-        for i in range(self.quest_size ** 2):
-            x = i % self.quest_size
-            y = i // self.quest_size
-            file_name = self.icons_data.get((y, x))
-            icon = QLabel()
-            if file_name:
-                icon.setPixmap(QPixmap(str(self.base_dir / file_name)))
-            icon.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            icon.setStyleSheet(f"border: 1px solid black")
-            icon.setFixedSize(QSize(300, 150))
-            self.quest_content.layout().addWidget(icon, y, x)
-        
-        self.back = QWidget()
-        self.back.setLayout(QHBoxLayout())
-        self.back.layout().setAlignment(Qt.AlignmentFlag.AlignLeft)
 
-        self.arrow_widget = QLabel()
-        self.arrow_widget.setFixedSize(20, 20)
-        self.arrow_widget.setPixmap(QPixmap(self.arrow_icon_path).scaled(20, 20))
+        self.started_at = time.time()
+        self.shown_at = time.perf_counter()
+        self.requested_ns = time.perf_counter_ns()
+        self.responses = []
+        self.trial = None
+        self.stats = None
+        self.exposure = None
+        self.quest_content = GridBoard(
+            settings.TRIAL_LEVELS[SESSION.level][0], self.board_size, PIXMAPS
+        )
+        self.quest_content.setObjectName("QuestBoard")
+        self.quest_content.cell_clicked.connect(self._cell_clicked)
 
-        self.arrow_widget.setAlignment(Qt.AlignmentFlag.AlignLeft)
-        self.back.layout().addWidget(self.arrow_widget)
         self.back_button = QPushButton(self.back_text)
+        self.back_button.setIcon(
+            QIcon(
+                PIXMAPS.pixmap(self.arrow_icon_path, self.arrow_size, keep_aspect=False)
+            )
+        )
+        self.back_button.setIconSize(QSize(self.arrow_size, self.arrow_size))
         self.back_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        self.back_button.setStyleSheet(f"border: none")
-        self.back_button.setFixedSize(50, 20)
-        self.back_button.clicked.connect(lambda: STACK.setCurrentIndex(1))
-        self.back.layout().addWidget(self.back_button)
-        
+        self.back_button.setObjectName("BackButton")
+        self.back_button.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+        self.back_button.clicked.connect(lambda: ROUTER.show("menu"))
+
         self.button_continue = QPushButton(self.button_text)
-        self.button_continue.clicked.connect(lambda: STACK.setCurrentIndex(1))
-        self.button_continue.setStyleSheet(
-            f"background-color: {self.button_color}; color: white"
+        self.button_continue.clicked.connect(self._finish_trial)
+        self.button_continue.setObjectName("ContinueButton")
+
+        layout = self.layout()
+        layout.addWidget(self.back_button, 0, 0, 1, 4, Qt.AlignmentFlag.AlignLeft)
+        layout.addWidget(self.header, 1, 1)
+        layout.addWidget(self.quest_content, 2, 1)
+        layout.addWidget(
+            self.button_continue, 1, 2, 2, 1, Qt.AlignmentFlag.AlignVCenter
         )
-        self.layout().addWidget(self.quest_content)
-        
-        self.wrapper = QWidget()
-        self.wrapper.setLayout(QHBoxLayout())
-        self.wrapper.setStyleSheet("background-color: white")
-        self.wrapper.layout().addWidget(self)
-        self.wrapper.layout().addWidget(self.button_continue)
-        self.wrapper.layout().setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        self.wrapper_2 = QWidget()
-        self.wrapper_2.setLayout(QVBoxLayout())
-        self.wrapper_2.layout().setAlignment(Qt.AlignmentFlag.AlignTop)
+        layout.setColumnStretch(0, 1)
+        layout.setColumnStretch(3, 1)
+        layout.setRowStretch(3, 1)
+
+    def showEvent(self, event):
+        if not event.spontaneous():
+            RECORDER.capturing = True
+            self._start_trial()
+
+    def _start_trial(self):
+        waiting = AUDIO_LOADS.get(SESSION.category)
+        if waiting is not None:
+            if self._audio_loaded not in waiting:
+                waiting.append(self._audio_loaded)
+            return
+        self.stats = STATS.get(SESSION.login, SESSION.category)
+        SESSION.level = DIFFICULTY.level(self.stats)
+        self.trial = take_layout(SESSION.level)
+        SESSION.level = self.trial.level
+        RECORDER.mark(
+            TRIAL,
+            json.dumps(
+                {
+                    "seed": TRIALS.seed,
+                    "category": SESSION.category,
+                    "level": self.trial.level,
+                    "index": self.trial.index,
+                    "size": self.trial.size,
+                    "cells": self._layout(),
+                }
+            ),
+        )
+        if self.quest_content.dimension != self.trial.size:
+            self.quest_content.set_dimension(self.trial.size)
+        cells = {
+            cell: str(self.base_dir / file_name)
+            for cell, file_name in self.trial.cells.items()
+        }
+        self.started_at = time.time()
+        self.shown_at = time.perf_counter()
+        self.requested_ns = time.perf_counter_ns()
+        self.responses = []
+        self.exposure = None
+        frames = None
+        if SESSION.exposure_ms is not None:
+            frames = PRESENTER.frames_for(
+                SESSION.exposure_ms, self.window().windowHandle()
+            )
+        PRESENTER.present(
+            self.quest_content,
+            lambda: self.quest_content.set_cells(cells),
+            lambda: self.quest_content.set_cells({}),
+            frames,
+            prepare=lambda: self.quest_content.prepare(cells),
+            on_onset=self._stimulus_onset,
+            on_offset=self._stimulus_offset,
+        )
+
+    def _audio_loaded(self):
+        if self.isVisible():
+            self._start_trial()
+
+    def _stimulus_onset(self, onset_ns: int):
+        self.shown_at = onset_ns / 1e9
+        INPUT_CLOCK.mark_stimulus(onset_ns)
+        RECORDER.mark(STIMULUS, json.dumps(self._layout()))
+        if SESSION.category in settings.AUDIO_EXERCISES:
+            if settings.AUDIO_CUE in AUDIO.clips:
+                AUDIO.schedule(settings.AUDIO_CUE, onset_ns + PRESENTER.frame_ns())
+
+    def _stimulus_offset(self, exposure: Exposure):
+        self.exposure = exposure
+
+    def hideEvent(self, event):
+        if not event.spontaneous():
+            RECORDER.capturing = False
+            PRESENTER.cancel()
+            INPUT_CLOCK.clear_stimulus()
+
+    def _timings(self) -> dict:
+        timings = {
+            "duration_ms": self._elapsed_ms(),
+            "trial": {
+                "seed": TRIALS.seed,
+                "level": self.trial.level,
+                "index": self.trial.index,
+            },
+        }
+        onsets = AUDIO.take_onsets()
+        if onsets:
+            shown_ms = self.shown_at * 1000
+            timings["audio_onsets"] = [
+                [
+                    onset.name,
+                    onset.requested_ns / 1e6 - shown_ms,
+                    onset.error_ms,
+                    onset.sink,
+                ]
+                for onset in onsets
+            ]
+        if self.exposure is not None:
+            timings["exposure"] = self.exposure.to_dict(self.requested_ns)
+        return timings
+
+    def _layout(self) -> list:
+        return [[row, col, name] for (row, col), name in self.trial.cells.items()]
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.shown_at) * 1000
+
+    def _response_ms(self) -> float:
+        sample = INPUT_CLOCK.last(QEvent.Type.MouseButtonPress)
+        if sample is None or sample.latency_ns == NO_STIMULUS:
+            return self._elapsed_ms()
+        return sample.latency_ns / 1e6
+
+    def _cell_clicked(self, row: int, col: int):
+        self.responses.append([row, col, self._response_ms()])
+
+    def _finish_trial(self):
+        PRESENTER.cancel()
+        self.stats.update(
+            accuracy(self.trial.cells, {(row, col) for row, col, _ in self.responses}),
+            [response_ms for _, _, response_ms in self.responses],
+        )
+        RESULTS.record(
+            Trial(
+                SESSION.login,
+                SESSION.category,
+                self._layout(),
+                self.responses,
+                self._timings(),
+                self.started_at,
+            ),
+            self.stats.to_dict(),
+        )
+        self._start_trial()
+
+
+@TRACER.traced
+class HelpPage(QWidget):
+    back_text = "Назад"
+
+    def __init__(self):
+        super().__init__()
+        from tools.help import HelpIndex, HelpViewer
 
-        self.wrapper_2.layout().addWidget(self.back)
-        self.wrapper_2.layout().addWidget(self.wrapper)
+        self.setObjectName("HelpPage")
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
+        self.setLayout(QVBoxLayout())
+        self.back_button = QPushButton(self.back_text)
+        self.back_button.setIcon(
+            QIcon(
+                PIXMAPS.pixmap(
+                    QuestWindow.arrow_icon_path,
+                    QuestWindow.arrow_size,
+                    keep_aspect=False,
+                )
+            )
+        )
+        self.back_button.setIconSize(
+            QSize(QuestWindow.arrow_size, QuestWindow.arrow_size)
+        )
+        self.back_button.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.back_button.setObjectName("BackButton")
+        self.back_button.clicked.connect(lambda: ROUTER.show("menu"))
+        self.viewer = HelpViewer(
+            HelpIndex.open(Path(BASEDIR, settings.HELP_BUNDLE)), settings.HELP_RESULTS
+        )
+        self.layout().addWidget(self.back_button, alignment=Qt.AlignmentFlag.AlignLeft)
+        self.layout().addWidget(self.viewer, stretch=1)
 
 
+@TRACER.traced
 class MainWindow(QMainWindow):
     window_name = "Neuronika"
 
@@ -534,19 +773,360 @@ class MainWindow(QMainWindow):
         self.index = QWidget()
         self.index.setLayout(STACK)
         self.setCentralWidget(self.index)
-        STACK.addWidget(LoginWindow())
-        STACK.addWidget(MenuWindow())
-        STACK.addWidget(QuestWindow().wrapper_2)
-        STACK.setCurrentIndex(0)
+        ROUTER.register("login", LoginWindow, prefetch=("menu",))
+        ROUTER.register("menu", MenuWindow, prefetch=("quest",))
+        ROUTER.register("quest", QuestWindow)
+        ROUTER.register("help", HelpPage)
+        ROUTER.show("login")
+
+
+def asset_manifest():
+    for file_name, _, _ in TopPanelButtons.buttons_data:
+        yield str(TopPanelButtons.base_dir / file_name), TopPanelButtons.size, False
+    yield TopPanel.logo_file_path, TopPanel.logo_size, False
+    yield TopPanel.user_file_path, TopPanel.user_size, False
+    for buttons_column in MainBlock.buttons_data:
+        for file_name, _ in buttons_column:
+            yield str(MainIcon.base_dir / file_name), MainIcon.end_size, True
+    yield Texture.texture_file_path, None, True
+    for file_name in settings.TRIAL_ICONS:
+        yield str(QuestWindow.base_dir / file_name), None, True
+    yield QuestWindow.arrow_icon_path, QuestWindow.arrow_size, False
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog=MainWindow.window_name)
+    parser.add_argument(
+        "--calibrate-hash",
+        action="store_true",
+        help="measure the password hash cost for this machine and exit",
+    )
+    parser.add_argument(
+        "--add-user",
+        metavar="LOGIN",
+        help="add a patient or reset their password and exit",
+    )
+    parser.add_argument(
+        "--build-assets",
+        nargs="?",
+        const=Path(BASEDIR, settings.ASSET_BUNDLE),
+        type=Path,
+        metavar="PATH",
+        help="pack the icons into a pre-scaled asset bundle and exit",
+    )
+    parser.add_argument(
+        "--build-help",
+        nargs="?",
+        const=Path(BASEDIR, settings.HELP_BUNDLE),
+        type=Path,
+        metavar="PATH",
+        help="compile the help pages and their search index and exit",
+    )
+    parser.add_argument(
+        "--theme",
+        choices=sorted(THEMES),
+        default=settings.THEME,
+        help="color theme to start with",
+    )
+    parser.add_argument(
+        "--input-self-test",
+        action="store_true",
+        help="measure the jitter added by input timestamping and exit",
+    )
+    parser.add_argument(
+        "--audio-sink",
+        choices=SINKS,
+        default=settings.AUDIO_SINK,
+        help="where auditory stimuli are played, wav writes them to a file",
+    )
+    parser.add_argument(
+        "--audio-self-test",
+        action="store_true",
+        help="measure the onset error of scheduled audio stimuli and exit",
+    )
+    parser.add_argument(
+        "--exposure",
+        type=float,
+        default=settings.EXPOSURE_MS,
+        metavar="MS",
+        help="hide the stimuli after this many milliseconds, rounded to frames",
+    )
+    parser.add_argument(
+        "--presentation-self-test",
+        action="store_true",
+        help="measure the duration error of frame-locked exposures and exit",
+    )
+    parser.add_argument(
+        "--trial-seed",
+        type=int,
+        metavar="SEED",
+        help="seed the trial generator to reproduce a sequence of layouts",
+    )
+    parser.add_argument(
+        "--watchdog",
+        action=argparse.BooleanOptionalAction,
+        default=settings.WATCHDOG,
+        help="log event loop stalls with the blocking stack",
+    )
+    parser.add_argument(
+        "--record",
+        nargs="?",
+        const=settings.RECORDINGS_DIR,
+        type=Path,
+        metavar="PATH",
+        help="record input events, page switches and stimuli to a session file",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        metavar="PATH",
+        help="replay a recorded session and exit",
+    )
+    parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        metavar="FACTOR",
+        help="replay speed multiplier, 0 replays as fast as possible",
+    )
+    parser.add_argument("--launch-probe", type=Path, help=argparse.SUPPRESS)
+    parser.add_argument(
+        TRACE_FLAG,
+        nargs="?",
+        const=settings.TRACE_FILE,
+        type=Path,
+        metavar="PATH",
+        help="write a Chrome trace of startup up to the first paint",
+    )
+    return parser.parse_known_args()[0]
+
+
+def logout():
+    if ROUTER.is_built("login"):
+        ROUTER.page("login").clear()
+    ROUTER.show("login")
+
+
+def open_help(topic: str):
+    ROUTER.show("help")
+    ROUTER.page("help").viewer.show_topic(topic)
+
+
+def prepare_audio(category: str):
+    exercise = settings.AUDIO_EXERCISES.get(category)
+    if exercise is None or category in AUDIO_LOADS:
+        return
+    clips = sorted(Path(BASEDIR, settings.AUDIO_DIR, exercise).glob("*.wav"))
+    if clips and not all(path.stem in AUDIO.clips for path in clips):
+        AUDIO_LOADS[category] = []
+        run_in_background(
+            AUDIO.load,
+            clips,
+            on_finished=lambda count: audio_loaded(category),
+            on_failed=lambda error: audio_loaded(category, error),
+        )
+
+
+def audio_loaded(category: str, error: Exception | None = None):
+    if error is not None:
+        LOGGER.warning("%s: audio clips failed to load: %s", category, error)
+    for callback in AUDIO_LOADS.pop(category, ()):
+        callback()
+
+
+def calibrate_hash() -> int:
+    rounds = PasswordManager.calibrate(settings.HASH_TARGET_TIME)
+    PasswordManager.save_rounds(settings.HASH_COST_FILE, rounds)
+    return rounds
+
+
+def take_layout(level: int) -> Layout:
+    if REPLAY_LAYOUTS:
+        return REPLAY_LAYOUTS.popleft()
+    return TRIALS.take(level, settings.TRIAL_TAKE_TIMEOUT)
+
+
+def replay_layouts(records: list) -> int:
+    for record in records:
+        if record.kind == TRIAL:
+            trial = json.loads(record.text)
+            if not REPLAY_LAYOUTS:
+                TRIALS.reseed(trial["seed"])
+            REPLAY_LAYOUTS.append(
+                Layout(
+                    trial["level"],
+                    trial["index"],
+                    trial["size"],
+                    {(row, col): name for row, col, name in trial["cells"]},
+                )
+            )
+    return len(REPLAY_LAYOUTS)
+
+
+def use_scratch_results(directory: str):
+    global RESULTS, STATS
+    RESULTS = ResultStore(
+        Path(directory, settings.RESULTS_FILE.name),
+        settings.RESULTS_BATCH_SIZE,
+        settings.RESULTS_FLUSH_INTERVAL,
+    )
+    STATS = StatsCache(RESULTS.stats, settings.TRIAL_LEVEL)
+    SESSION.login = settings.REPLAY_LOGIN
+
+
+def replay_marker(kind: int, text: str):
+    if kind == PAGE and ROUTER.current != text:
+        ROUTER.show(text)
+    elif kind == TRIAL:
+        category = json.loads(text)["category"]
+        if SESSION.category != category:
+            SESSION.category = category
+            prepare_audio(category)
+    elif kind == STIMULUS and ROUTER.is_built("quest"):
+        trial = ROUTER.page("quest").trial
+        recorded = {(row, col): name for row, col, name in json.loads(text)}
+        if trial is None or trial.cells != recorded:
+            LOGGER.warning("replayed layout differs from the recorded stimulus")
+
+
+def replay_finished(replayer: SessionReplayer, app: QApplication):
+    lag = sorted(replayer.lag_ms) or [0.0]
+    print(
+        f"replayed {len(replayer.records)} records in {replayer.duration:.2f}s, "
+        f"lag median {lag[len(lag) // 2]:.2f}ms, max {lag[-1]:.2f}ms"
+    )
+    app.quit()
+
+
+def launch_probe(path: Path, app: QApplication):
+    path.write_text(str(time.time_ns()))
+    app.quit()
 
 
 def main():
-    app = QApplication(sys.argv)
+    args = parse_args()
+    if args.calibrate_hash:
+        print(f"pbkdf2-sha256 rounds: {calibrate_hash()}")
+        return
+    if args.add_user is not None:
+        import getpass
+
+        USERS.add(args.add_user, getpass.getpass(f"{args.add_user} password: "))
+        return
+    if args.build_assets is not None:
+        count = build_bundle(
+            args.build_assets, BASEDIR, asset_manifest(), settings.ASSET_RATIOS
+        )
+        print(f"{args.build_assets}: {count} images")
+        return
+    if args.build_help is not None:
+        from tools.help import build_help
+
+        count = build_help(args.build_help, Path(BASEDIR, settings.HELP_DIR))
+        print(f"{args.build_help}: {count} pages")
+        return
+
+    if args.replay is not None:
+        scratch = tempfile.TemporaryDirectory(
+            prefix="neuronika-replay-", ignore_cleanup_errors=True
+        )
+        use_scratch_results(scratch.name)
+
+    with TRACER.span("QApplication", "app"):
+        app = QApplication(sys.argv)
+    app.aboutToQuit.connect(RESULTS.close)
+    if args.replay is not None:
+        app.aboutToQuit.connect(scratch.cleanup)
+    if args.input_self_test:
+        from tools.timing import self_test
+
+        for name, value in self_test(app).items():
+            print(f"{name}: {value:g}")
+        return
+    AUDIO.sink = create_sink(args.audio_sink, settings.AUDIO_WAV_FILE)
+    if args.audio_self_test:
+        from tools.audio import self_test
+
+        report = self_test(AUDIO.sink)
+        print(f"sink: {report.pop('sink')}")
+        for name, value in report.items():
+            print(f"{name}: {value:g}")
+        return
+    app.aboutToQuit.connect(AUDIO.close)
+    if args.presentation_self_test:
+        from tools.presentation import self_test
+
+        for name, value in self_test(app).items():
+            print(f"{name}: {value:g}")
+        return
+    SESSION.exposure_ms = args.exposure
+    if args.trial_seed is not None:
+        TRIALS.reseed(args.trial_seed)
+    app.aboutToQuit.connect(TRIALS.stop)
+    app.aboutToQuit.connect(PRESENTER.cancel)
+    app.installEventFilter(INPUT_CLOCK)
+    if args.watchdog:
+        from tools.watchdog import Watchdog
+
+        watchdog = Watchdog(
+            settings.WATCHDOG_THRESHOLD,
+            settings.WATCHDOG_HEARTBEAT,
+            settings.WATCHDOG_LOG_FILE,
+            settings.WATCHDOG_LOG_SIZE,
+            settings.WATCHDOG_LOG_BACKUPS,
+        )
+        watchdog.start()
+        app.aboutToQuit.connect(watchdog.stop)
+    with TRACER.span("theme", "app"):
+        THEME.apply(args.theme)
+    if not PasswordManager.load_rounds(settings.HASH_COST_FILE):
+        after_idle(
+            app,
+            settings.HASH_CALIBRATE_IDLE,
+            lambda: run_in_background(
+                calibrate_hash, on_finished=PasswordManager.use_rounds
+            ),
+        )
 
     app.setWindowIcon(QIcon(str(Path(BASEDIR, "app.ico").resolve())))
 
     window = MainWindow()
-    window.show()
+    after_first_paint(
+        window,
+        lambda: QTimer.singleShot(
+            settings.WARM_DELAY,
+            lambda: (
+                run_in_background(warm_imports, settings.WARM_MODULES),
+                TRIALS.start(),
+            ),
+        ),
+    )
+    if args.record is not None:
+        path = args.record
+        if path.is_dir() or path == settings.RECORDINGS_DIR:
+            path = session_path(path)
+        RECORDER.start(path)
+        app.installEventFilter(RECORDER)
+        ROUTER.observers.append(lambda name: RECORDER.mark(PAGE, name))
+        app.aboutToQuit.connect(RECORDER.stop)
+    if args.replay is not None:
+        records = read_session(args.replay)[1]
+        replay_layouts(records)
+        replayer = SessionReplayer(records, args.replay_speed)
+        replayer.marker.connect(replay_marker)
+        replayer.finished.connect(lambda: replay_finished(replayer, app))
+        after_first_paint(window, lambda: QTimer.singleShot(0, replayer.start))
+    if args.launch_probe is not None:
+        after_first_paint(window, lambda: launch_probe(args.launch_probe, app))
+    if args.trace_startup is not None:
+        TRACER.watch_first_frame(
+            window,
+            lambda: QTimer.singleShot(
+                settings.TRACE_SETTLE_TIME, lambda: TRACER.finish(args.trace_startup)
+            ),
+        )
+    with TRACER.span("MainWindow.show", "paint"):
+        window.show()
 
     app.exec()
 
@@ -1,2 +1,82 @@
+import os
+import tempfile
+from pathlib import Path
+
 LOGIN = "sasha"
 PASSWORD = "$pbkdf2-sha256$29000$TCklhJDSutc6h1CqldKaMw$Itqoh9n.HoCoL/PD2Mv6u.bMxHprvURCMCsbzjjzJHI"
+PIXMAP_CACHE_LIMIT = 32 * 1024 * 1024
+PAGE_IDLE_TIMEOUT = 5 * 60
+PAGE_MEMORY_LIMIT = 64 * 1024 * 1024
+PAGE_PREFETCH_DELAY = 500
+PAGE_SWEEP_INTERVAL = 30 * 1000
+DATA_DIR = Path.home() / ".neuronika"
+CREDENTIALS_FILE = DATA_DIR / "credentials.json"
+USERS_FILE = DATA_DIR / "users.sqlite3"
+HASH_COST_FILE = DATA_DIR / "hash_cost"
+HASH_TARGET_TIME = 0.3
+HASH_CALIBRATE_IDLE = 10 * 1000
+TRACE_FILE = Path("startup-trace.json")
+TRACE_SETTLE_TIME = 2000
+ASSET_BUNDLE = "icons.bundle"
+ASSET_RATIOS = (1.0, 2.0)
+HELP_DIR = "help"
+HELP_BUNDLE = "help.bundle"
+HELP_RESULTS = 20
+RESULTS_FILE = DATA_DIR / "results.sqlite3"
+RESULTS_BATCH_SIZE = 32
+RESULTS_FLUSH_INTERVAL = 1.0
+THEME = "default"
+
+WATCHDOG = False
+WATCHDOG_THRESHOLD = 0.5
+WATCHDOG_HEARTBEAT = 100
+WATCHDOG_LOG_FILE = DATA_DIR / "stalls.log"
+WATCHDOG_LOG_SIZE = 1024 * 1024
+WATCHDOG_LOG_BACKUPS = 3
+
+WARM_DELAY = 250
+WARM_MODULES = ("passlib.hash", "tools.help")
+
+RECORDINGS_DIR = DATA_DIR / "sessions"
+RECORD_COMPRESS = True
+RECORD_FLUSH_INTERVAL = 1000
+REPLAY_LOGIN = "replay"
+
+AUDIO_SINK = "qt"
+AUDIO_WAV_FILE = DATA_DIR / "audio.wav"
+AUDIO_DIR = "sounds"
+AUDIO_EXERCISES = {"Слуховое восприятие": "hearing"}
+AUDIO_CUE = "cue"
+
+TRIAL_LEVELS = (
+    (3, 5, 1),
+    (4, 6, 1),
+    (5, 8, 1),
+    (8, 10, 2),
+    (12, 16, 2),
+    (20, 30, 2),
+)
+TRIAL_LEVEL = 0
+TRIAL_ICONS = ("atom.PNG", "bag.PNG", "canoe.PNG", "open_book.PNG", "timer.PNG")
+TRIAL_SEED = None
+TRIAL_POOL_SIZE = 4
+TRIAL_HISTORY = 5
+TRIAL_MAX_OVERLAP = 0.5
+TRIAL_BATCH = 256
+TRIAL_TAKE_TIMEOUT = 0.05
+
+INPUT_HISTORY = 1024
+
+DIFFICULTY_RAISE_AT = 0.85
+DIFFICULTY_LOWER_AT = 0.5
+DIFFICULTY_MIN_TRIALS = 3
+
+EXPOSURE_MS = None
+EXPOSURE_DROP_TOLERANCE = 1.5
+
+SHARED_IMAGE_CACHE = False
+SHARED_IMAGE_CACHE_FILE = Path(
+    os.environ.get("PROGRAMDATA", tempfile.gettempdir()), "Neuronika", "images.cache"
+)
+SHARED_IMAGE_CACHE_SIZE = 64 * 1024 * 1024
+SHARED_IMAGE_CACHE_SLOTS = 4096
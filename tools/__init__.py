@@ -1,11 +1,69 @@
-from passlib.hash import pbkdf2_sha256
+import time
+from pathlib import Path
+
+
+def pbkdf2_sha256():
+    from passlib.hash import pbkdf2_sha256
+
+    return pbkdf2_sha256
 
 
 class PasswordManager:
-    @staticmethod
-    def gen_hash(password: str) -> str:
-        return pbkdf2_sha256.hash(password)
+    rounds = 29000
+    probe_rounds = 10000
+    probe_samples = 3
+
+    @classmethod
+    def hasher(cls):
+        return pbkdf2_sha256().using(rounds=cls.rounds, min_desired_rounds=cls.rounds)
+
+    @classmethod
+    def gen_hash(cls, password: str) -> str:
+        return cls.hasher().hash(password)
 
     @staticmethod
     def verify(password: str, hash_: str) -> bool:
-        return pbkdf2_sha256.verify(password, hash_)
+        return pbkdf2_sha256().verify(password, hash_)
+
+    @classmethod
+    def needs_rehash(cls, hash_: str) -> bool:
+        return cls.hasher().needs_update(hash_)
+
+    @classmethod
+    def verify_and_update(cls, password: str, hash_: str) -> tuple[bool, str | None]:
+        hasher = cls.hasher()
+        if not cls.verify(password, hash_):
+            return False, None
+        if hasher.needs_update(hash_):
+            return True, hasher.hash(password)
+        return True, None
+
+    @classmethod
+    def calibrate(cls, target: float) -> int:
+        hasher = pbkdf2_sha256().using(rounds=cls.probe_rounds)
+        elapsed = []
+        for _ in range(cls.probe_samples):
+            start = time.perf_counter()
+            hasher.hash("calibration")
+            elapsed.append(time.perf_counter() - start)
+        rounds = round(cls.probe_rounds * target / min(elapsed))
+        return max(pbkdf2_sha256().default_rounds, rounds)
+
+    @classmethod
+    def use_rounds(cls, rounds: int):
+        cls.rounds = rounds
+
+    @classmethod
+    def load_rounds(cls, path: Path) -> bool:
+        try:
+            cls.rounds = int(path.read_text())
+        except (OSError, ValueError):
+            return False
+        return True
+
+    @staticmethod
+    def save_rounds(path: Path, rounds: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(str(rounds))
+        tmp_path.replace(path)
@@ -0,0 +1,195 @@
+import math
+from bisect import insort
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass, field
+
+
+@dataclass
+class Welford:
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    def update(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+@dataclass
+class EWMA:
+    alpha: float
+    value: float | None = None
+
+    def update(self, value: float):
+        if self.value is None:
+            self.value = value
+        else:
+            self.value += self.alpha * (value - self.value)
+
+
+@dataclass
+class P2Quantile:
+    p: float
+    heights: list[float] = field(default_factory=list)
+    positions: list[int] = field(default_factory=lambda: [1, 2, 3, 4, 5])
+    desired: list[float] = field(default_factory=list)
+
+    def __post_init__(self):
+        if not self.desired:
+            p = self.p
+            self.desired = [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]
+
+    @property
+    def increments(self) -> tuple[float, ...]:
+        p = self.p
+        return 0, p / 2, p, (1 + p) / 2, 1
+
+    @property
+    def value(self) -> float | None:
+        q = self.heights
+        if not q:
+            return None
+        if len(q) < 5:
+            return q[min(len(q) - 1, round(self.p * (len(q) - 1)))]
+        return q[2]
+
+    def update(self, value: float):
+        q, n = self.heights, self.positions
+        if len(q) < 5:
+            insort(q, value)
+            return
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = next(i for i in range(1, 5) if value < q[i]) - 1
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i, increment in enumerate(self.increments):
+            self.desired[i] += increment
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                height = self._parabolic(i, d)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + d * (q[i + d] - q[i]) / (n[i + d] - n[i])
+                q[i] = height
+                n[i] += d
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self.heights, self.positions
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+
+@dataclass
+class PatientStats:
+    level: int = 0
+    level_trials: int = 0
+    trials: int = 0
+    accuracy: Welford = field(default_factory=Welford)
+    accuracy_fast: EWMA = field(default_factory=lambda: EWMA(0.3))
+    accuracy_slow: EWMA = field(default_factory=lambda: EWMA(0.05))
+    response: Welford = field(default_factory=Welford)
+    response_recent: EWMA = field(default_factory=lambda: EWMA(0.1))
+    response_median: P2Quantile = field(default_factory=lambda: P2Quantile(0.5))
+    response_p90: P2Quantile = field(default_factory=lambda: P2Quantile(0.9))
+
+    @property
+    def trend(self) -> float:
+        if self.accuracy_fast.value is None:
+            return 0.0
+        return self.accuracy_fast.value - self.accuracy_slow.value
+
+    def update(self, accuracy: float, response_ms: Iterable[float]):
+        self.trials += 1
+        self.level_trials += 1
+        self.accuracy.update(accuracy)
+        self.accuracy_fast.update(accuracy)
+        self.accuracy_slow.update(accuracy)
+        for value in response_ms:
+            self.response.update(value)
+            self.response_recent.update(value)
+            self.response_median.update(value)
+            self.response_p90.update(value)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, state: dict) -> "PatientStats":
+        return cls(
+            state["level"],
+            state["level_trials"],
+            state["trials"],
+            Welford(**state["accuracy"]),
+            EWMA(**state["accuracy_fast"]),
+            EWMA(**state["accuracy_slow"]),
+            Welford(**state["response"]),
+            EWMA(**state["response_recent"]),
+            P2Quantile(**state["response_median"]),
+            P2Quantile(**state["response_p90"]),
+        )
+
+
+def accuracy(targets: Iterable, clicked: Iterable) -> float:
+    targets, clicked = set(targets), set(clicked)
+    if not targets and not clicked:
+        return 1.0
+    return len(targets & clicked) / len(targets | clicked)
+
+
+class StatsCache:
+    def __init__(self, load: Callable[[str, str], dict | None], initial_level: int):
+        self.load = load
+        self.initial_level = initial_level
+        self._stats: dict[tuple[str, str], PatientStats] = {}
+
+    def get(self, patient: str, category: str) -> PatientStats:
+        key = patient, category
+        stats = self._stats.get(key)
+        if stats is None:
+            state = self.load(patient, category)
+            if state is None:
+                stats = PatientStats(level=self.initial_level)
+            else:
+                stats = PatientStats.from_dict(state)
+            self._stats[key] = stats
+        return stats
+
+
+class DifficultyController:
+    def __init__(self, levels: int, raise_at: float, lower_at: float, min_trials: int):
+        self.levels = levels
+        self.raise_at = raise_at
+        self.lower_at = lower_at
+        self.min_trials = min_trials
+
+    def level(self, stats: PatientStats) -> int:
+        level = min(stats.level, self.levels - 1)
+        recent = stats.accuracy_fast.value
+        if recent is not None and stats.level_trials >= self.min_trials:
+            if recent >= self.raise_at and stats.trend >= 0:
+                level = min(level + 1, self.levels - 1)
+            elif recent <= self.lower_at:
+                level = max(level - 1, 0)
+        if level != stats.level:
+            stats.level = level
+            stats.level_trials = 0
+        return level
@@ -0,0 +1,38 @@
+import time
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+from PyQt6.QtWidgets import QGraphicsItem
+
+
+class ScaleAnimator(QObject):
+    interval = 16
+
+    def __init__(self, duration: int):
+        super().__init__()
+        self.duration = duration
+        self.frames = 0
+        self._active: dict[QGraphicsItem, tuple[float, float, float]] = {}
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.setInterval(self.interval)
+        self._timer.timeout.connect(self.tick)
+
+    @property
+    def running(self) -> bool:
+        return bool(self._active)
+
+    def animate(self, item: QGraphicsItem, scale: float):
+        self._active[item] = item.scale(), scale, time.perf_counter()
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def tick(self):
+        now = time.perf_counter()
+        for item, (start, end, started_at) in list(self._active.items()):
+            progress = min(1.0, (now - started_at) * 1000 / self.duration)
+            item.setScale(start + (end - start) * progress)
+            if progress >= 1.0:
+                del self._active[item]
+        self.frames += 1
+        if not self._active:
+            self._timer.stop()
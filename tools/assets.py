@@ -0,0 +1,142 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from collections.abc import Iterable
+from pathlib import Path
+
+from PyQt6.QtGui import QImage
+
+from tools.pixmaps import PixmapCache
+
+MAGIC = b"NRKA"
+VERSION = 3
+HEADER = struct.Struct("<4sII16s")
+ALIGNMENT = 16
+IMAGE_FORMAT = QImage.Format.Format_ARGB32_Premultiplied
+
+
+def build_bundle(
+    path: Path,
+    root: str,
+    manifest: Iterable[tuple[str, int | None, bool]],
+    ratios: Iterable[float],
+) -> int:
+    variants = {}
+    for file_name, size, keep_aspect in manifest:
+        for ratio in ratios if size is not None else (1.0,):
+            key = AssetBundle.key(root, file_name, size, ratio, keep_aspect)
+            variants[key] = file_name
+
+    index = []
+    blobs = []
+    offset = 0
+    for key, file_name in sorted(variants.items(), key=lambda item: str(item[0])):
+        image = PixmapCache.scale(QImage(file_name), *key[1:])
+        image = image.convertToFormat(IMAGE_FORMAT)
+        data = image.constBits().asstring(image.sizeInBytes())
+        index.append(
+            {
+                "file": key[0],
+                "size": key[1],
+                "ratio": key[2],
+                "keep_aspect": key[3],
+                "width": image.width(),
+                "height": image.height(),
+                "bytes_per_line": image.bytesPerLine(),
+                "offset": offset,
+            }
+        )
+        padding = -len(data) % ALIGNMENT
+        blobs.append(data + bytes(padding))
+        offset += len(data) + padding
+
+    header = json.dumps(index).encode()
+    digest = hashlib.blake2b(header, digest_size=16)
+    for blob in blobs:
+        digest.update(blob)
+    data_start = HEADER.size + len(header)
+    data_start += -data_start % ALIGNMENT
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(header), digest.digest()))
+        file.write(header)
+        file.write(bytes(data_start - HEADER.size - len(header)))
+        for blob in blobs:
+            file.write(blob)
+    os.replace(tmp_path, path)
+    return len(index)
+
+
+class AssetBundle:
+    def __init__(self, path: Path, root: str):
+        self.root = root
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_size, self.digest = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} asset bundle")
+        data_start = HEADER.size + index_size
+        data_start += -data_start % ALIGNMENT
+        self._entries = {}
+        self._sources = {}
+        for entry in json.loads(self._map[HEADER.size : HEADER.size + index_size]):
+            entry["offset"] += data_start
+            key = entry["file"], entry["size"], entry["ratio"], entry["keep_aspect"]
+            self._entries[key] = entry
+            source = self._sources.get(entry["file"])
+            if source is None or entry["width"] > source["width"]:
+                self._sources[entry["file"]] = entry
+
+    @classmethod
+    def open(cls, path: Path, root: str) -> "AssetBundle | None":
+        try:
+            return cls(path, root)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def key(
+        root: str,
+        file_name: str,
+        size: int | None,
+        ratio: float,
+        keep_aspect: bool = True,
+    ) -> tuple:
+        file_name = Path(os.path.relpath(file_name, root)).as_posix()
+        return file_name, size, ratio, keep_aspect if size is not None else True
+
+    def image(
+        self, file_name: str, size: int | None, ratio: float, keep_aspect: bool = True
+    ) -> QImage | None:
+        key = self.key(self.root, file_name, size, ratio, keep_aspect)
+        entry = self._entries.get(key)
+        return self._wrap(entry) if entry is not None else None
+
+    def source(self, file_name: str) -> QImage | None:
+        entry = self._sources.get(self.key(self.root, file_name, None, 1.0)[0])
+        return self._wrap(entry) if entry is not None else None
+
+    def source_id(self, file_name: str) -> bytes | None:
+        name = self.key(self.root, file_name, None, 1.0)[0]
+        return self.digest + name.encode() if name in self._sources else None
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def _wrap(self, entry: dict) -> QImage:
+        start = entry["offset"]
+        end = start + entry["bytes_per_line"] * entry["height"]
+        image = QImage(
+            memoryview(self._map)[start:end],
+            entry["width"],
+            entry["height"],
+            entry["bytes_per_line"],
+            IMAGE_FORMAT,
+        )
+        image.setDevicePixelRatio(entry["ratio"])
+        return image
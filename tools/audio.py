@@ -0,0 +1,426 @@
+import heapq
+import logging
+import math
+import threading
+import time
+import wave
+from array import array
+from collections.abc import Callable, Iterable
+from pathlib import Path
+from typing import NamedTuple
+
+from PyQt6.QtCore import QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+
+LOGGER = logging.getLogger("neuronika.audio")
+
+
+class AudioFormat(NamedTuple):
+    sample_rate: int
+    channels: int
+    sample_width: int
+
+    @property
+    def bytes_per_second(self) -> int:
+        return self.sample_rate * self.channels * self.sample_width
+
+    @property
+    def frame_size(self) -> int:
+        return self.channels * self.sample_width
+
+
+class Clip(NamedTuple):
+    name: str
+    format: AudioFormat
+    pcm: bytes
+
+    @property
+    def duration(self) -> float:
+        return len(self.pcm) / self.format.bytes_per_second
+
+
+class Onset(NamedTuple):
+    name: str
+    requested_ns: int
+    actual_ns: int
+    sink: str
+
+    @property
+    def error_ms(self) -> float:
+        return (self.actual_ns - self.requested_ns) / 1e6
+
+
+def decode(path: Path) -> Clip:
+    path = Path(path)
+    with wave.open(str(path), "rb") as file:
+        format_ = AudioFormat(
+            file.getframerate(), file.getnchannels(), file.getsampwidth()
+        )
+        return Clip(path.stem, format_, file.readframes(file.getnframes()))
+
+
+def tone(
+    name: str,
+    frequency: float,
+    duration: float,
+    format_: AudioFormat = AudioFormat(44100, 1, 2),
+    volume: float = 0.5,
+) -> Clip:
+    count = round(duration * format_.sample_rate)
+    amplitude = volume * 32767
+    step = 2 * math.pi * frequency / format_.sample_rate
+    samples = array(
+        "h",
+        (
+            round(amplitude * math.sin(step * index))
+            for index in range(count)
+            for _ in range(format_.channels)
+        ),
+    )
+    return Clip(name, format_._replace(sample_width=2), samples.tobytes())
+
+
+class NullSink:
+    name = "null"
+
+    def open(self, format_: AudioFormat):
+        self.format = format_
+
+    def write(self, clip: Clip) -> int:
+        return time.perf_counter_ns()
+
+    def close(self):
+        pass
+
+
+class WavSink:
+    name = "wav"
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = None
+        self._origin = 0
+        self._written = 0
+
+    def open(self, format_: AudioFormat):
+        self.format = format_
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = wave.open(str(self.path), "wb")
+        self._file.setframerate(format_.sample_rate)
+        self._file.setnchannels(format_.channels)
+        self._file.setsampwidth(format_.sample_width)
+        self._origin = time.perf_counter_ns()
+        self._written = 0
+
+    def write(self, clip: Clip) -> int:
+        now = time.perf_counter_ns()
+        frames = (now - self._origin) * self.format.sample_rate // 1_000_000_000
+        offset = frames * self.format.frame_size
+        if offset > self._written:
+            self._file.writeframesraw(bytes(offset - self._written))
+            self._written = offset
+        self._file.writeframesraw(clip.pcm)
+        self._written += len(clip.pcm)
+        return now
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class QtOutput(QObject):
+    wake = pyqtSignal()
+    stopping = pyqtSignal()
+    pump_interval = 5
+
+    def __init__(self, format_: AudioFormat):
+        super().__init__()
+        self.format = format_
+        self.error: Exception | None = None
+        self.opened = threading.Event()
+        self._sink = None
+        self._device = None
+        self._timer = None
+        self._pending = bytearray()
+        self._queued = 0
+        self._pumped_ns = 0
+        self._lock = threading.Lock()
+        self.wake.connect(self.pump)
+        self.stopping.connect(self.stop)
+
+    @pyqtSlot()
+    def open(self):
+        try:
+            from PyQt6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices
+
+            qt_format = QAudioFormat()
+            qt_format.setSampleRate(self.format.sample_rate)
+            qt_format.setChannelCount(self.format.channels)
+            qt_format.setSampleFormat(
+                {
+                    1: QAudioFormat.SampleFormat.UInt8,
+                    2: QAudioFormat.SampleFormat.Int16,
+                }[self.format.sample_width]
+            )
+            device = QMediaDevices.defaultAudioOutput()
+            if device.isNull():
+                raise OSError("no audio output device")
+            if not device.isFormatSupported(qt_format):
+                raise OSError(f"{device.description()} does not play {self.format}")
+            self._sink = QAudioSink(device, qt_format, self)
+            self._device = self._sink.start()
+            if (
+                self._device is None
+                or self._sink.error().name != "NoError"
+                or self._sink.state().name == "StoppedState"
+            ):
+                raise OSError(f"{device.description()}: {self._sink.error().name}")
+            self._timer = QTimer(self)
+            self._timer.setInterval(self.pump_interval)
+            self._timer.timeout.connect(self.pump)
+        except Exception as error:
+            self.error = error
+            self._device = None
+        finally:
+            self.opened.set()
+
+    def push(self, pcm: bytes, now_ns: int) -> int:
+        with self._lock:
+            drained = (
+                (now_ns - self._pumped_ns) * self.format.bytes_per_second
+                // 1_000_000_000
+            )
+            ahead = max(0, self._queued - drained) + len(self._pending)
+            self._pending += pcm
+        self.wake.emit()
+        return ahead
+
+    @pyqtSlot()
+    def pump(self):
+        if self._device is None:
+            return
+        with self._lock:
+            free = self._sink.bytesFree()
+            if self._pending and free > 0:
+                written = self._device.write(bytes(self._pending[:free]))
+                if written > 0:
+                    del self._pending[:written]
+            self._queued = self._sink.bufferSize() - self._sink.bytesFree()
+            self._pumped_ns = time.perf_counter_ns()
+            pending = bool(self._pending)
+        if self._sink.error().name != "NoError":
+            self.error = OSError(f"audio output failed: {self._sink.error().name}")
+            self._timer.stop()
+        elif pending:
+            self._timer.start()
+        else:
+            self._timer.stop()
+
+    @pyqtSlot()
+    def stop(self):
+        if self._timer is not None:
+            self._timer.stop()
+        if self._sink is not None:
+            self._sink.stop()
+        QThread.currentThread().quit()
+
+
+class QtSink:
+    name = "qt"
+    open_timeout = 2.0
+
+    def __init__(self):
+        self._thread = None
+        self._output = None
+
+    def open(self, format_: AudioFormat):
+        self.format = format_
+        self._thread = QThread()
+        self._thread.setObjectName("audio-output")
+        self._output = QtOutput(format_)
+        self._output.moveToThread(self._thread)
+        self._thread.started.connect(self._output.open)
+        self._thread.start()
+        if not self._output.opened.wait(self.open_timeout):
+            self._output.error = OSError("audio output did not open in time")
+        if self._output.error is not None:
+            error = self._output.error
+            self.close()
+            raise OSError(f"qt audio sink: {error}") from error
+
+    def write(self, clip: Clip) -> int:
+        if self._output.error is not None:
+            raise OSError(f"qt audio sink: {self._output.error}")
+        now = time.perf_counter_ns()
+        queued = self._output.push(clip.pcm, now)
+        return now + queued * 1_000_000_000 // self.format.bytes_per_second
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._output.stopping.emit()
+        self._thread.wait(round(self.open_timeout * 1000))
+        self._thread = None
+
+
+SINKS = ("null", "qt", "wav")
+
+
+def create_sink(name: str, path: Path):
+    if name == "wav":
+        return WavSink(path)
+    if name == "qt":
+        return QtSink()
+    return NullSink()
+
+
+class AudioEngine:
+    spin_ns = 2_000_000
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.clips: dict[str, Clip] = {}
+        self.onsets: list[Onset] = []
+        self.on_onset: Callable[[Onset], None] | None = None
+        self._format = None
+        self._queue: list[tuple[int, int, str]] = []
+        self._sequence = 0
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._opened = threading.Event()
+
+    def load(self, paths: Iterable[Path]) -> int:
+        clips = [decode(path) for path in paths]
+        for clip in clips:
+            self.add(clip)
+        if clips:
+            self.start()
+        return len(clips)
+
+    def start(self):
+        with self._condition:
+            self._start()
+        self._opened.wait()
+
+    def add(self, clip: Clip):
+        with self._condition:
+            if self._format is None:
+                self._format = clip.format
+            elif clip.format != self._format:
+                raise ValueError(
+                    f"{clip.name}: {clip.format} does not match {self._format}"
+                )
+            self.clips[clip.name] = clip
+
+    def schedule(self, name: str, at_ns: int):
+        if name not in self.clips:
+            raise KeyError(name)
+        with self._condition:
+            heapq.heappush(self._queue, (at_ns, self._sequence, name))
+            self._sequence += 1
+            self._start()
+            self._condition.notify()
+
+    def play(self, name: str, delay_ms: float = 0.0) -> int:
+        at_ns = time.perf_counter_ns() + round(delay_ms * 1_000_000)
+        self.schedule(name, at_ns)
+        return at_ns
+
+    def cancel(self):
+        with self._condition:
+            self._queue.clear()
+
+    def take_onsets(self) -> list[Onset]:
+        with self._condition:
+            onsets, self.onsets = self.onsets, []
+        return onsets
+
+    def close(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._opened.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="audio", daemon=True
+            )
+            self._thread.start()
+
+    def _open_sink(self):
+        try:
+            self.sink.open(self._format)
+        except Exception as error:
+            self._fall_back(error)
+        else:
+            LOGGER.info("playing through the %s audio sink", self.sink.name)
+
+    def _fall_back(self, error: Exception):
+        LOGGER.warning(
+            "%s audio sink failed, stimuli will not be heard: %s", self.sink.name, error
+        )
+        self.sink = NullSink()
+        self.sink.open(self._format)
+
+    def _run(self):
+        try:
+            self._open_sink()
+        finally:
+            self._opened.set()
+        try:
+            self._play_loop()
+        finally:
+            self.sink.close()
+
+    def _play_loop(self):
+        while True:
+            with self._condition:
+                while not self._stopping and not self._queue:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+                at_ns, _, name = self._queue[0]
+                wait_ns = at_ns - time.perf_counter_ns() - self.spin_ns
+                if wait_ns > 0:
+                    self._condition.wait(wait_ns / 1e9)
+                    continue
+                heapq.heappop(self._queue)
+                clip = self.clips[name]
+            while time.perf_counter_ns() < at_ns:
+                pass
+            try:
+                actual_ns = self.sink.write(clip)
+            except Exception as error:
+                self.sink.close()
+                self._fall_back(error)
+                actual_ns = self.sink.write(clip)
+            onset = Onset(name, at_ns, actual_ns, self.sink.name)
+            with self._condition:
+                self.onsets.append(onset)
+            if self.on_onset is not None:
+                self.on_onset(onset)
+
+
+def self_test(sink, count: int = 50, interval_ms: float = 20.0) -> dict:
+    engine = AudioEngine(sink)
+    engine.add(tone("click", 1000, 0.005))
+    start = time.perf_counter_ns() + 50_000_000
+    for index in range(count):
+        engine.schedule("click", start + round(index * interval_ms * 1_000_000))
+    while len(engine.onsets) < count:
+        time.sleep(interval_ms / 1000)
+    engine.close()
+    errors = sorted(abs(onset.error_ms) for onset in engine.onsets)
+    return {
+        "sink": engine.sink.name,
+        "onsets": count,
+        "mean_abs_error_ms": sum(errors) / count,
+        "p95_abs_error_ms": errors[max(0, math.ceil(count * 0.95) - 1)],
+        "max_abs_error_ms": errors[-1],
+    }
@@ -0,0 +1,221 @@
+from collections.abc import Callable, Sequence
+from typing import NamedTuple
+
+from PyQt6.QtCore import QPoint, QRect, QRectF, QSize, Qt
+from PyQt6.QtGui import (
+    QColor,
+    QCursor,
+    QImage,
+    QPainter,
+    QPen,
+    QPixmap,
+    QTextDocument,
+)
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+
+from tools.theme import Theme
+
+
+class TiledBackground:
+    grow_step = 256
+
+    def __init__(self, tile: QPixmap):
+        self.tile = tile
+        self.rebuilds = 0
+        self._pixmap = QPixmap()
+
+    def _extent(self, length: int, tile: int) -> int:
+        step = tile * max(1, self.grow_step // tile)
+        return -(-length // step) * step
+
+    def pixmap(self, size: QSize, ratio: float) -> QPixmap:
+        cached = self._pixmap
+        if (
+            cached.isNull()
+            or cached.devicePixelRatio() != ratio
+            or cached.width() < size.width() * ratio
+            or cached.height() < size.height() * ratio
+        ):
+            tile = self.tile.deviceIndependentSize().toSize()
+            width = self._extent(size.width(), max(1, tile.width()))
+            height = self._extent(size.height(), max(1, tile.height()))
+            cached = QPixmap(round(width * ratio), round(height * ratio))
+            cached.setDevicePixelRatio(ratio)
+            painter = QPainter(cached)
+            painter.drawTiledPixmap(QRect(0, 0, width, height), self.tile)
+            painter.end()
+            self._pixmap = cached
+            self.rebuilds += 1
+        return cached
+
+    def cached(self) -> list[QPixmap]:
+        return [] if self._pixmap.isNull() else [self._pixmap]
+
+    def paint(self, painter: QPainter, rect: QRect, size: QSize, ratio: float):
+        pixmap = self.pixmap(size, ratio)
+        painter.drawPixmap(
+            QRectF(rect),
+            pixmap,
+            QRectF(
+                rect.x() * ratio,
+                rect.y() * ratio,
+                rect.width() * ratio,
+                rect.height() * ratio,
+            ),
+        )
+
+
+class StripButton(NamedTuple):
+    image: QImage
+    text: str
+    action: Callable[[], None] | None
+
+
+class ButtonStrip(QWidget):
+    padding = 9
+    spacing = 4
+
+    def __init__(self, buttons: Sequence[StripButton], theme: Theme, text_role: str):
+        super().__init__()
+        self.buttons = tuple(buttons)
+        self.theme = theme
+        self.text_role = text_role
+        self.setMouseTracking(True)
+        self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+        theme.changed.connect(self.update)
+
+    @staticmethod
+    def icon_size(image: QImage) -> QSize:
+        return image.deviceIndependentSize().toSize()
+
+    def button_width(self, button: StripButton) -> int:
+        text = self.fontMetrics().horizontalAdvance(button.text)
+        return max(self.icon_size(button.image).width(), text) + 2 * self.padding
+
+    def sizeHint(self) -> QSize:
+        icon = max(self.icon_size(button.image).height() for button in self.buttons)
+        return QSize(
+            sum(self.button_width(button) for button in self.buttons),
+            icon + self.spacing + self.fontMetrics().height() + 2 * self.padding,
+        )
+
+    def cached_pixmaps(self) -> list[QImage]:
+        return [button.image for button in self.buttons]
+
+    def button_rects(self) -> list[QRect]:
+        rects = []
+        x = 0
+        for button in self.buttons:
+            width = self.button_width(button)
+            rects.append(QRect(x, 0, width, self.height()))
+            x += width
+        return rects
+
+    def button_at(self, pos: QPoint) -> StripButton | None:
+        for button, rect in zip(self.buttons, self.button_rects()):
+            if rect.contains(pos):
+                return button
+        return None
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setPen(QColor(self.theme.color(self.text_role)))
+        text_height = self.fontMetrics().height()
+        for button, rect in zip(self.buttons, self.button_rects()):
+            if not rect.intersects(event.rect()):
+                continue
+            icon = QRect(QPoint(), self.icon_size(button.image))
+            content = icon.height() + self.spacing + text_height
+            icon.moveTopLeft(
+                QPoint(
+                    rect.center().x() - icon.width() // 2,
+                    (rect.height() - content) // 2,
+                )
+            )
+            painter.drawImage(icon, button.image)
+            top = icon.bottom() + 1 + self.spacing
+            painter.drawText(
+                QRect(rect.x(), top, rect.width(), text_height),
+                Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop,
+                button.text,
+            )
+        painter.end()
+
+    def mouseMoveEvent(self, ev):
+        button = self.button_at(ev.position().toPoint())
+        if button is not None and button.action is not None:
+            self.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        else:
+            self.unsetCursor()
+
+    def mousePressEvent(self, ev):
+        button = self.button_at(ev.position().toPoint())
+        if button is not None and button.action is not None:
+            button.action()
+
+
+class InfoCard(QWidget):
+    padding = 10
+    margin = 9
+    radius = 3
+
+    def __init__(
+        self,
+        html: str,
+        text_width: int,
+        theme: Theme,
+        border_role: str,
+        background_role: str,
+    ):
+        super().__init__()
+        self.theme = theme
+        self.border_role = border_role
+        self.background_role = background_role
+        self.document = QTextDocument()
+        self.document.setDocumentMargin(0)
+        self.document.setDefaultFont(self.font())
+        self.document.setHtml(html)
+        self.document.setTextWidth(text_width)
+        self.card_size = QSize(
+            text_width + 2 * self.padding,
+            round(self.document.size().height()) + 2 * self.padding,
+        )
+        self._pixmap = QPixmap()
+        self._key = None
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.setFixedHeight(self.card_size.height() + 2 * self.margin)
+        self.setMinimumWidth(self.card_size.width() + 2 * self.margin)
+        theme.changed.connect(self.update)
+
+    def card(self, ratio: float) -> QPixmap:
+        key = ratio, self.theme.name
+        if key != self._key:
+            pixmap = QPixmap(self.card_size * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            painter.setPen(QPen(QColor(self.theme.color(self.border_role)), 1))
+            painter.setBrush(QColor(self.theme.color(self.background_role)))
+            width, height = self.card_size.width(), self.card_size.height()
+            painter.drawRoundedRect(
+                QRectF(0.5, 0.5, width - 1, height - 1),
+                self.radius,
+                self.radius,
+            )
+            painter.translate(self.padding, self.padding)
+            self.document.drawContents(painter)
+            painter.end()
+            self._pixmap, self._key = pixmap, key
+        return self._pixmap
+
+    def cached_pixmaps(self) -> list[QPixmap]:
+        return [self._pixmap]
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        rect = QRect(QPoint(), self.card_size)
+        rect.moveCenter(self.rect().center())
+        painter.drawPixmap(rect.topLeft(), self.card(self.devicePixelRatio()))
+        painter.end()
@@ -0,0 +1,127 @@
+from PyQt6.QtCore import QLine, QPoint, QRect, QSize, pyqtSignal
+from PyQt6.QtGui import QImage, QPainter, QPalette
+from PyQt6.QtWidgets import QSizePolicy, QWidget
+
+from tools.pixmaps import PixmapCache
+
+
+class GridBoard(QWidget):
+    cell_clicked = pyqtSignal(int, int)
+    padding = 4
+    full_update_ratio = 0.5
+
+    def __init__(self, size: int, board_size: QSize, pixmaps: PixmapCache):
+        super().__init__()
+        self.pixmaps = pixmaps
+        self.board_size = board_size
+        self._cells: dict[tuple[int, int], str] = {}
+        self._icons: dict[str, QImage] = {}
+        self.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+        self.set_dimension(size)
+
+    def set_dimension(self, size: int):
+        self.dimension = size
+        self.cell = QSize(
+            self.board_size.width() // size, self.board_size.height() // size
+        )
+        self._cells = {}
+        self._icons.clear()
+        self.setFixedSize(self.cell.width() * size, self.cell.height() * size)
+        self.update()
+
+    @property
+    def cells(self) -> dict[tuple[int, int], str]:
+        return dict(self._cells)
+
+    def cell_at(self, pos: QPoint) -> tuple[int, int] | None:
+        row = pos.y() // self.cell.height()
+        col = pos.x() // self.cell.width()
+        if 0 <= row < self.dimension and 0 <= col < self.dimension:
+            return row, col
+        return None
+
+    def cell_rect(self, row: int, col: int) -> QRect:
+        return QRect(
+            col * self.cell.width(),
+            row * self.cell.height(),
+            self.cell.width(),
+            self.cell.height(),
+        )
+
+    def set_cells(self, cells: dict[tuple[int, int], str]):
+        changed = {
+            key
+            for key in self._cells.keys() | cells.keys()
+            if self._cells.get(key) != cells.get(key)
+        }
+        self._cells = dict(cells)
+        if len(changed) > self.dimension**2 * self.full_update_ratio:
+            self.update()
+            return
+        for row, col in changed:
+            self.update(self.cell_rect(row, col))
+
+    def set_cell(self, row: int, col: int, file_name: str | None):
+        cells = dict(self._cells)
+        if file_name is None:
+            cells.pop((row, col), None)
+        else:
+            cells[row, col] = file_name
+        self.set_cells(cells)
+
+    def prepare(self, cells: dict[tuple[int, int], str]):
+        for file_name in set(cells.values()):
+            self.icon(file_name)
+
+    def icon(self, file_name: str) -> QImage:
+        image = self._icons.get(file_name)
+        if image is None:
+            side = min(self.cell.width(), self.cell.height()) - 2 * self.padding
+            image = self.pixmaps.image(file_name)
+            ratio = image.devicePixelRatio()
+            if max(image.width(), image.height()) / ratio > side:
+                image = self.pixmaps.image(file_name, side)
+            self._icons[file_name] = image
+        return image
+
+    def paintEvent(self, event):
+        rect = event.rect()
+        width, height = self.cell.width(), self.cell.height()
+        first_row = max(0, rect.top() // height)
+        last_row = min(self.dimension - 1, rect.bottom() // height)
+        first_col = max(0, rect.left() // width)
+        last_col = min(self.dimension - 1, rect.right() // width)
+
+        painter = QPainter(self)
+        painter.setPen(self.palette().color(QPalette.ColorRole.WindowText))
+        top, bottom = first_row * height, (last_row + 1) * height - 1
+        left, right = first_col * width, (last_col + 1) * width - 1
+        lines = []
+        for row in range(first_row, last_row + 1):
+            y = row * height
+            lines.append(QLine(left, y, right, y))
+            lines.append(QLine(left, y + height - 1, right, y + height - 1))
+        for col in range(first_col, last_col + 1):
+            x = col * width
+            lines.append(QLine(x, top, x, bottom))
+            lines.append(QLine(x + width - 1, top, x + width - 1, bottom))
+        painter.drawLines(lines)
+
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                file_name = self._cells.get((row, col))
+                if file_name is None:
+                    continue
+                image = self.icon(file_name)
+                ratio = image.devicePixelRatio()
+                icon_rect = QRect(
+                    0, 0, round(image.width() / ratio), round(image.height() / ratio)
+                )
+                icon_rect.moveCenter(self.cell_rect(row, col).center())
+                painter.drawImage(icon_rect, image)
+        painter.end()
+
+    def mousePressEvent(self, ev):
+        cell = self.cell_at(ev.position().toPoint())
+        if cell is not None:
+            self.cell_clicked.emit(*cell)
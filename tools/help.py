@@ -0,0 +1,344 @@
+import json
+import os
+import re
+import struct
+import sys
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple
+
+from PyQt6.QtCore import QUrl
+from PyQt6.QtWidgets import (
+    QHBoxLayout,
+    QLineEdit,
+    QListWidget,
+    QTextBrowser,
+    QVBoxLayout,
+    QWidget,
+)
+
+MAGIC = b"NRKH"
+VERSION = 1
+HEADER = struct.Struct("<4sIII")
+TITLE_WEIGHT = 5
+PREFIX_WEIGHT = 0.5
+MIN_PREFIX = 2
+WORD = re.compile(r"[0-9a-zа-яё]+")
+LINK_TARGET = re.compile(r"\]\([^)]*\)")
+
+VOWELS = "аеиоуыэюя"
+AFTER_A = ("а", "я")
+PERFECTIVE_GERUND = (
+    (("в", "вши", "вшись"), AFTER_A),
+    (("ив", "ивши", "ившись", "ыв", "ывши", "ывшись"), ()),
+)
+REFLEXIVE = ((("ся", "сь"), ()),)
+ADJECTIVE = (
+    (
+        ("ее", "ие", "ые", "ое", "ими", "ыми", "ей", "ий", "ый", "ой", "ем", "им")
+        + ("ым", "ом", "его", "ого", "ему", "ому", "их", "ых", "ую", "юю", "ая")
+        + ("яя", "ою", "ею"),
+        (),
+    ),
+)
+PARTICIPLE = (
+    (("ем", "нн", "вш", "ющ", "щ"), AFTER_A),
+    (("ивш", "ывш", "ующ"), ()),
+)
+VERB = (
+    (
+        ("ла", "на", "ете", "йте", "ли", "й", "л", "ем", "н", "ло", "но", "ет")
+        + ("ют", "ны", "ть", "ешь", "нно"),
+        AFTER_A,
+    ),
+    (
+        ("ила", "ыла", "ена", "ейте", "уйте", "ите", "или", "ыли", "ей", "уй")
+        + ("ил", "ыл", "им", "ым", "ен", "ило", "ыло", "ено", "ят", "ует", "уют")
+        + ("ит", "ыт", "ены", "ить", "ыть", "ишь", "ую", "ю"),
+        (),
+    ),
+)
+NOUN = (
+    (
+        ("а", "ев", "ов", "ие", "ье", "е", "иями", "ями", "ами", "еи", "ии", "и")
+        + ("ией", "ей", "ой", "ий", "й", "иям", "ям", "ием", "ем", "ам", "ом")
+        + ("о", "у", "ах", "иях", "ях", "ы", "ь", "ию", "ью", "ю", "ия", "ья", "я"),
+        (),
+    ),
+)
+SUPERLATIVE = ((("ейш", "ейше"), ()),)
+DERIVATIONAL = ("ость", "ост")
+
+
+def _region(word: str, start: int) -> int:
+    for index in range(start + 1, len(word)):
+        if word[index] not in VOWELS and word[index - 1] in VOWELS:
+            return index + 1
+    return len(word)
+
+
+def _remove(word: str, groups) -> str | None:
+    best = None
+    for endings, preceded in groups:
+        for ending in endings:
+            if word.endswith(ending) and (best is None or len(ending) > len(best[0])):
+                best = ending, preceded
+    if best is None:
+        return None
+    ending, preceded = best
+    stem = word[: -len(ending)]
+    if preceded and not stem.endswith(preceded):
+        return None
+    return stem
+
+
+def stem(word: str) -> str:
+    word = word.lower().replace("ё", "е")
+    vowel = next((index for index, char in enumerate(word) if char in VOWELS), None)
+    if vowel is None:
+        return word
+    prefix, rv = word[: vowel + 1], word[vowel + 1 :]
+    r2 = _region(word, _region(word, 0))
+
+    stemmed = _remove(rv, PERFECTIVE_GERUND)
+    if stemmed is None:
+        stemmed = _remove(rv, REFLEXIVE)
+        rv = rv if stemmed is None else stemmed
+        stemmed = _remove(rv, ADJECTIVE)
+        if stemmed is not None:
+            participle = _remove(stemmed, PARTICIPLE)
+            stemmed = stemmed if participle is None else participle
+        else:
+            stemmed = _remove(rv, VERB)
+            if stemmed is None:
+                stemmed = _remove(rv, NOUN)
+    rv = rv if stemmed is None else stemmed
+
+    if rv.endswith("и"):
+        rv = rv[:-1]
+    for ending in DERIVATIONAL:
+        if rv.endswith(ending) and len(prefix) + len(rv) - len(ending) >= r2:
+            rv = rv[: -len(ending)]
+            break
+    if rv.endswith("нн"):
+        rv = rv[:-1]
+    else:
+        stemmed = _remove(rv, SUPERLATIVE)
+        if stemmed is not None:
+            rv = stemmed[:-1] if stemmed.endswith("нн") else stemmed
+        elif rv.endswith("ь"):
+            rv = rv[:-1]
+    return prefix + rv
+
+
+def words(text: str) -> list[str]:
+    return WORD.findall(text.lower())
+
+
+class Topic(NamedTuple):
+    slug: str
+    title: str
+    text: str
+
+
+class Match(NamedTuple):
+    topic: Topic
+    score: float
+
+
+def read_topics(source: Path) -> list[Topic]:
+    topics = []
+    for path in sorted(Path(source).glob("*.md")):
+        text = path.read_text(encoding="utf-8")
+        title = next(
+            (line[2:].strip() for line in text.splitlines() if line.startswith("# ")),
+            path.stem,
+        )
+        topics.append(Topic(path.stem, title, text))
+    return topics
+
+
+def _native(values: array) -> array:
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def build_help(path: Path, source: Path) -> int:
+    topics = read_topics(source)
+    weights: dict[str, Counter] = {}
+    for index, topic in enumerate(topics):
+        text = LINK_TARGET.sub("]", topic.text)
+        counts = Counter(stem(word) for word in words(text))
+        for word in words(topic.title):
+            counts[stem(word)] += TITLE_WEIGHT
+        for term, count in counts.items():
+            weights.setdefault(term, Counter())[index] = count
+
+    terms = sorted(weights)
+    offsets = array("I", [0])
+    postings = array("H")
+    for term in terms:
+        for index, weight in sorted(weights[term].items()):
+            postings.extend((index, min(weight, 0xFFFF)))
+        offsets.append(len(postings))
+
+    meta = zlib.compress(
+        json.dumps(
+            {"topics": [list(topic) for topic in topics], "terms": terms},
+            ensure_ascii=False,
+        ).encode(),
+        9,
+    )
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, len(meta), len(terms)))
+        file.write(meta)
+        file.write(_native(offsets).tobytes())
+        file.write(_native(postings).tobytes())
+    os.replace(tmp_path, path)
+    return len(topics)
+
+
+class HelpIndex:
+    def __init__(self, path: Path):
+        data = Path(path).read_bytes()
+        magic, version, meta_size, term_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} help bundle")
+        start = HEADER.size + meta_size
+        meta = json.loads(zlib.decompress(data[HEADER.size : start]))
+        self.topics = [Topic(*topic) for topic in meta["topics"]]
+        self.slugs = {topic.slug: topic for topic in self.topics}
+        self.terms = meta["terms"]
+        self._offsets = array("I")
+        self._offsets.frombytes(data[start : start + 4 * (term_count + 1)])
+        self._postings = array("H")
+        self._postings.frombytes(data[start + 4 * (term_count + 1) :])
+        _native(self._offsets)
+        _native(self._postings)
+
+    @classmethod
+    def open(cls, path: Path) -> "HelpIndex | None":
+        try:
+            return cls(path)
+        except (OSError, ValueError):
+            return None
+
+    def postings(self, term_index: int) -> memoryview:
+        start, end = self._offsets[term_index], self._offsets[term_index + 1]
+        return memoryview(self._postings)[start:end]
+
+    def match(self, word: str) -> dict[int, float]:
+        term = stem(word)
+        index = end = bisect_left(self.terms, term)
+        if len(term) >= MIN_PREFIX:
+            while end < len(self.terms) and self.terms[end].startswith(term):
+                end += 1
+        elif index < len(self.terms) and self.terms[index] == term:
+            end = index + 1
+        scores = {}
+        for term_index in range(index, end):
+            factor = 1.0 if self.terms[term_index] == term else PREFIX_WEIGHT
+            postings = self.postings(term_index)
+            for offset in range(0, len(postings), 2):
+                topic, weight = postings[offset], postings[offset + 1]
+                scores[topic] = max(scores.get(topic, 0.0), weight * factor)
+        return scores
+
+    def search(self, query: str, limit: int) -> list[Match]:
+        query_words = words(query)
+        if not query_words:
+            return [Match(topic, 0.0) for topic in self.topics[:limit]]
+        scores = None
+        for word in query_words:
+            matched = self.match(word)
+            if scores is None:
+                scores = matched
+            else:
+                scores = {
+                    topic: score + matched[topic]
+                    for topic, score in scores.items()
+                    if topic in matched
+                }
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [Match(self.topics[topic], score) for topic, score in ranked[:limit]]
+
+
+class HelpViewer(QWidget):
+    placeholder = "Поиск по справке"
+    missing = "Справка не найдена. Соберите её командой `--build-help`."
+    not_found = "Ничего не найдено"
+    list_width = 280
+
+    def __init__(self, index: HelpIndex | None, limit: int):
+        super().__init__()
+        self.index = index
+        self.limit = limit
+        self.matches: list[Match] = []
+        self.setLayout(QHBoxLayout())
+
+        self.search = QLineEdit()
+        self.search.setObjectName("HelpSearch")
+        self.search.setPlaceholderText(self.placeholder)
+        self.search.setClearButtonEnabled(True)
+        self.search.textChanged.connect(self.find)
+        self.results = QListWidget()
+        self.results.setObjectName("HelpResults")
+        self.results.currentRowChanged.connect(self._show_match)
+        side = QVBoxLayout()
+        side.addWidget(self.search)
+        side.addWidget(self.results)
+        side.setContentsMargins(0, 0, 0, 0)
+        side_widget = QWidget()
+        side_widget.setLayout(side)
+        side_widget.setFixedWidth(self.list_width)
+
+        self.text = QTextBrowser()
+        self.text.setObjectName("HelpText")
+        self.text.setOpenLinks(False)
+        self.text.anchorClicked.connect(self._open_link)
+
+        self.layout().addWidget(side_widget)
+        self.layout().addWidget(self.text, stretch=1)
+        self.find("")
+
+    def find(self, query: str):
+        if self.index is None:
+            self.text.setMarkdown(self.missing)
+            return
+        self.matches = self.index.search(query, self.limit)
+        self.results.blockSignals(True)
+        self.results.clear()
+        self.results.addItems([match.topic.title for match in self.matches])
+        self.results.blockSignals(False)
+        if not self.matches:
+            self.text.setMarkdown(self.not_found)
+        elif query.strip():
+            self.results.setCurrentRow(0)
+
+    def show_topic(self, slug: str):
+        if self.index is None or slug not in self.index.slugs:
+            return
+        self.search.clear()
+        self.text.setMarkdown(self.index.slugs[slug].text)
+        for row, match in enumerate(self.matches):
+            if match.topic.slug == slug:
+                self.results.blockSignals(True)
+                self.results.setCurrentRow(row)
+                self.results.blockSignals(False)
+
+    def _show_match(self, row: int):
+        if 0 <= row < len(self.matches):
+            self.text.setMarkdown(self.matches[row].topic.text)
+
+    def _open_link(self, url: QUrl):
+        if url.scheme():
+            return
+        self.show_topic(url.path())
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QGuiApplication, QImage, QPixmap
+
+from tools.tracing import TRACER
+
+
+class PixmapCache:
+    def __init__(self, limit: int, bundle=None, shared=None):
+        self.limit = limit
+        self.bundle = bundle
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self._items: OrderedDict[tuple, QPixmap | QImage] = OrderedDict()
+        self._cost = 0
+
+    @staticmethod
+    def ratio() -> float:
+        screen = QGuiApplication.primaryScreen()
+        return screen.devicePixelRatio() if screen is not None else 1.0
+
+    @staticmethod
+    def cost(pixmap: QPixmap | QImage) -> int:
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def key(
+        self,
+        file_name: str,
+        size: int | None,
+        ratio: float | None,
+        keep_aspect: bool = True,
+    ) -> tuple:
+        if size is None:
+            return str(file_name), None, 1.0, True
+        return str(file_name), int(size), ratio or self.ratio(), keep_aspect
+
+    def pixmap(
+        self,
+        file_name: str,
+        size: int | None = None,
+        ratio: float | None = None,
+        keep_aspect: bool = True,
+    ) -> QPixmap:
+        key = self.key(file_name, size, ratio, keep_aspect)
+        pixmap = self._lookup(key)
+        if pixmap is None:
+            pixmap = self._insert(key, QPixmap.fromImage(self.render(key)))
+        return pixmap
+
+    def image(
+        self,
+        file_name: str,
+        size: int | None = None,
+        ratio: float | None = None,
+        keep_aspect: bool = True,
+    ) -> QImage:
+        key = self.key(file_name, size, ratio, keep_aspect)
+        image = self._lookup((QImage, *key))
+        if image is None:
+            image = self._insert((QImage, *key), self.render(key))
+        return image
+
+    def release(self, pixmaps: Iterable[QPixmap | QImage]):
+        keys = {pixmap.cacheKey() for pixmap in pixmaps}
+        for key, pixmap in list(self._items.items()):
+            if pixmap.cacheKey() in keys:
+                del self._items[key]
+                self._cost -= self.cost(pixmap)
+
+    def clear(self):
+        self._items.clear()
+        self._cost = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "items": len(self._items),
+            "cost": self._cost,
+            "limit": self.limit,
+        }
+
+    def render(self, key: tuple) -> QImage:
+        with TRACER.span(f"load {Path(key[0]).name}", "image") as args:
+            args["source"] = "bundle"
+            image = self.bundle.image(*key) if self.bundle is not None else None
+            if image is None and self.shared is not None:
+                args["source"] = "shared"
+                image = self.shared.image(*key)
+            if image is None:
+                args["source"] = "decode"
+                image = self.scale(self.decode(key[0]), *key[1:])
+                if self.shared is not None:
+                    self.shared.publish(*key, image)
+            return image
+
+    def decode(self, file_name: str) -> QImage:
+        image = self.bundle.source(file_name) if self.bundle is not None else None
+        return image if image is not None else QImage(file_name)
+
+    @staticmethod
+    def scale(
+        image: QImage, size: int | None, ratio: float, keep_aspect: bool = True
+    ) -> QImage:
+        if size is None or image.isNull():
+            return image
+        side = round(size * ratio)
+        image = image.scaled(
+            side,
+            side,
+            Qt.AspectRatioMode.KeepAspectRatio
+            if keep_aspect
+            else Qt.AspectRatioMode.IgnoreAspectRatio,
+            Qt.TransformationMode.SmoothTransformation,
+        )
+        image.setDevicePixelRatio(ratio)
+        return image
+
+    def _lookup(self, key: tuple) -> QPixmap | QImage | None:
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._items.move_to_end(key)
+        return item
+
+    def _insert(self, key: tuple, pixmap: QPixmap | QImage) -> QPixmap | QImage:
+        self._items[key] = pixmap
+        self._cost += self.cost(pixmap)
+        while self._cost > self.limit and len(self._items) > 1:
+            _, evicted = self._items.popitem(last=False)
+            self._cost -= self.cost(evicted)
+        return pixmap
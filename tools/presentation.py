@@ -0,0 +1,222 @@
+import time
+from collections.abc import Callable
+from typing import NamedTuple
+
+from PyQt6.QtCore import QEvent, QObject
+from PyQt6.QtGui import QWindow
+from PyQt6.QtWidgets import QApplication, QWidget
+
+DEFAULT_REFRESH_RATE = 60.0
+
+
+class Exposure(NamedTuple):
+    frames: int | None
+    frame_ns: int
+    onset_ns: int
+    offset_ns: int
+    paint_lag_ns: int
+    dropped: int
+    completed: bool
+
+    @property
+    def shown_frames(self) -> int | None:
+        if not self.offset_ns:
+            return None
+        return round((self.offset_ns - self.onset_ns) / self.frame_ns)
+
+    @property
+    def duration_ms(self) -> float | None:
+        if not self.offset_ns:
+            return None
+        return (self.offset_ns - self.onset_ns) / 1e6
+
+    @property
+    def compromised(self) -> bool:
+        return (
+            self.dropped > 0
+            or self.paint_lag_ns > self.frame_ns
+            or not self.completed
+            or (self.frames is not None and self.shown_frames != self.frames)
+        )
+
+    def to_dict(self, origin_ns: int = 0) -> dict:
+        return {
+            "frames": self.frames,
+            "shown_frames": self.shown_frames,
+            "frame_ms": self.frame_ns / 1e6,
+            "onset_ms": (self.onset_ns - origin_ns) / 1e6,
+            "duration_ms": self.duration_ms,
+            "paint_lag_ms": self.paint_lag_ns / 1e6,
+            "dropped_frames": self.dropped,
+            "completed": self.completed,
+            "compromised": self.compromised,
+        }
+
+
+class PresentationScheduler(QObject):
+    def __init__(self, drop_tolerance: float):
+        super().__init__()
+        self.drop_tolerance = drop_tolerance
+        self.exposures: list[Exposure] = []
+        self._window: QWindow | None = None
+        self._target: QWidget | None = None
+        self._pending = None
+        self._onset_ns = 0
+        self._painted_ns = 0
+        self._last_tick = 0
+        self._dropped = 0
+
+    @property
+    def active(self) -> bool:
+        return self._pending is not None
+
+    def frame_ns(self, window: QWindow | None = None) -> int:
+        window = window or self._window
+        screen = window.screen() if window is not None else None
+        rate = screen.refreshRate() if screen is not None else 0.0
+        return round(1e9 / (rate or DEFAULT_REFRESH_RATE))
+
+    def frames_for(self, duration_ms: float, window: QWindow | None = None) -> int:
+        return max(1, round(duration_ms * 1e6 / self.frame_ns(window)))
+
+    def present(
+        self,
+        target: QWidget,
+        show: Callable[[], None],
+        hide: Callable[[], None] | None = None,
+        frames: int | None = None,
+        prepare: Callable[[], None] | None = None,
+        on_onset: Callable[[int], None] | None = None,
+        on_offset: Callable[[Exposure], None] | None = None,
+    ):
+        self.cancel()
+        if prepare is not None:
+            prepare()
+        self._attach(target)
+        self._pending = show, hide, frames, on_onset, on_offset
+        self._onset_ns = 0
+        self._painted_ns = 0
+        self._last_tick = 0
+        self._dropped = 0
+        self._window.requestUpdate()
+
+    def cancel(self):
+        if self._pending is None:
+            return
+        if self._onset_ns:
+            hide = self._pending[1]
+            if hide is not None:
+                hide()
+            self._finish(time.perf_counter_ns(), completed=False)
+        else:
+            self._pending = None
+            self._detach()
+
+    def take_exposures(self) -> list[Exposure]:
+        exposures, self.exposures = self.exposures, []
+        return exposures
+
+    def _attach(self, target: QWidget):
+        window = target.window().windowHandle()
+        if window is None:
+            raise RuntimeError(f"{type(target).__name__} is not shown")
+        window.installEventFilter(self)
+        target.installEventFilter(self)
+        self._window, self._target = window, target
+
+    def _detach(self):
+        self._window.removeEventFilter(self)
+        self._target.removeEventFilter(self)
+        self._target = None
+
+    def _finish(self, offset_ns: int, completed: bool):
+        frames, on_offset = self._pending[2], self._pending[4]
+        exposure = Exposure(
+            frames,
+            self.frame_ns(),
+            self._onset_ns,
+            offset_ns,
+            max(0, self._painted_ns - self._onset_ns),
+            self._dropped,
+            completed,
+        )
+        self.exposures.append(exposure)
+        self._pending = None
+        self._detach()
+        if on_offset is not None:
+            on_offset(exposure)
+
+    def _tick(self, tick_ns: int):
+        frame_ns = self.frame_ns()
+        gap = tick_ns - self._last_tick
+        if self._last_tick and gap > frame_ns * self.drop_tolerance:
+            self._dropped += round(gap / frame_ns) - 1
+        self._last_tick = tick_ns
+        show, hide, frames, on_onset, _ = self._pending
+        if not self._onset_ns:
+            show()
+            self._onset_ns = tick_ns
+            if on_onset is not None:
+                on_onset(tick_ns)
+        elif frames is None:
+            self._finish(0, completed=True)
+            return
+        elif tick_ns - self._onset_ns >= frames * frame_ns - min(frame_ns, gap) // 2:
+            hide()
+            self._finish(tick_ns, completed=True)
+            return
+        self._window.requestUpdate()
+
+    def eventFilter(self, obj, event):
+        if self._pending is None:
+            return False
+        if obj is self._window and event.type() == QEvent.Type.UpdateRequest:
+            self._tick(time.perf_counter_ns())
+        elif obj is self._target and event.type() == QEvent.Type.Paint:
+            if self._onset_ns and not self._painted_ns:
+                self._painted_ns = time.perf_counter_ns()
+                if self._pending[2] is None:
+                    self._finish(0, completed=True)
+        return False
+
+
+def self_test(
+    app: QApplication, count: int = 20, duration_ms: float = 100.0, gap_ms: int = 50
+) -> dict:
+    from PyQt6.QtCore import QEventLoop, QTimer
+
+    scheduler = PresentationScheduler(1.5)
+    target = QWidget()
+    target.resize(200, 200)
+    target.show()
+    loop = QEventLoop()
+
+    def present(remaining: int):
+        if not remaining:
+            loop.quit()
+            return
+        scheduler.present(
+            target,
+            lambda: target.setStyleSheet("background: black"),
+            lambda: target.setStyleSheet("background: white"),
+            scheduler.frames_for(duration_ms),
+            on_offset=lambda exposure: QTimer.singleShot(
+                gap_ms, lambda: present(remaining - 1)
+            ),
+        )
+
+    QTimer.singleShot(gap_ms, lambda: present(count))
+    loop.exec()
+    target.close()
+    exposures = scheduler.take_exposures()
+    errors = [abs(exposure.duration_ms - duration_ms) for exposure in exposures]
+    return {
+        "exposures": len(exposures),
+        "frame_ms": exposures[0].frame_ns / 1e6,
+        "frames": exposures[0].frames,
+        "mean_abs_error_ms": sum(errors) / len(errors),
+        "max_abs_error_ms": max(errors),
+        "max_paint_lag_ms": max(exposure.paint_lag_ns for exposure in exposures) / 1e6,
+        "dropped_frames": sum(exposure.dropped for exposure in exposures),
+        "compromised": sum(exposure.compromised for exposure in exposures),
+    }
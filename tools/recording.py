@@ -0,0 +1,353 @@
+import queue
+import struct
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import NamedTuple
+
+from PyQt6.QtCore import QEvent, QObject, QPointF, Qt, QTimer, pyqtSignal
+from PyQt6.QtGui import QGuiApplication, QKeyEvent, QMouseEvent, QWindow
+
+MAGIC = b"NRKS"
+VERSION = 3
+HEADER = struct.Struct("<4sIq")
+CHUNK = struct.Struct("<BI")
+RECORD = struct.Struct("<qB3xIiiIII")
+SUFFIX = ".session"
+SUBPIXEL = 16
+
+MOUSE_PRESS = 1
+MOUSE_RELEASE = 2
+MOUSE_DOUBLE_CLICK = 3
+MOUSE_MOVE = 4
+KEY_PRESS = 5
+KEY_RELEASE = 6
+PAGE = 7
+STIMULUS = 8
+RESIZE = 9
+STRING = 10
+TRIAL = 11
+MARKERS = (PAGE, STIMULUS, TRIAL)
+
+MOUSE_KINDS = {
+    QEvent.Type.MouseButtonPress: MOUSE_PRESS,
+    QEvent.Type.MouseButtonRelease: MOUSE_RELEASE,
+    QEvent.Type.MouseButtonDblClick: MOUSE_DOUBLE_CLICK,
+    QEvent.Type.MouseMove: MOUSE_MOVE,
+}
+KEY_KINDS = {
+    QEvent.Type.KeyPress: KEY_PRESS,
+    QEvent.Type.KeyRelease: KEY_RELEASE,
+}
+EVENT_TYPES = {kind: type_ for type_, kind in (MOUSE_KINDS | KEY_KINDS).items()}
+
+
+class Record(NamedTuple):
+    time_ns: int
+    kind: int
+    target: str
+    x: float
+    y: float
+    a: int
+    b: int
+    c: int
+    text: str
+
+
+def session_path(directory: Path) -> Path:
+    return Path(directory, time.strftime("%Y%m%d-%H%M%S") + SUFFIX)
+
+
+class SessionRecorder(QObject):
+    chunk_size = 64 * 1024
+
+    def __init__(self, compress: bool, flush_interval: int):
+        super().__init__()
+        self.compress = compress
+        self.path = None
+        self.events = 0
+        self.capturing = False
+        self._buffer = bytearray()
+        self._strings: dict[str, int] = {}
+        self._origin = 0
+        self._queue = queue.Queue()
+        self._writer = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(flush_interval)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def recording(self) -> bool:
+        return self._writer is not None
+
+    def start(self, path: Path):
+        if self.recording:
+            return
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file = self.path.open("wb")
+        file.write(HEADER.pack(MAGIC, VERSION, time.time_ns()))
+        self._origin = time.perf_counter_ns()
+        self._strings.clear()
+        self.events = 0
+        self._writer = threading.Thread(
+            target=self._write_loop, args=(file,), name="recorder", daemon=True
+        )
+        self._writer.start()
+        self._timer.start()
+        for window in QGuiApplication.topLevelWindows():
+            if window.isVisible():
+                self._resize(window)
+
+    def stop(self):
+        if not self.recording:
+            return
+        self._timer.stop()
+        self.flush()
+        self._queue.put(None)
+        self._writer.join()
+        self._writer = None
+
+    def flush(self):
+        if self._buffer:
+            self._queue.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def mark(self, kind: int, text: str):
+        if self.recording:
+            data = text.encode()
+            self._append(kind, 0, 0, 0, 0, len(data), 0, data)
+
+    def eventFilter(self, obj, event):
+        if not isinstance(obj, QWindow):
+            return False
+        type_ = event.type()
+        if type_ == QEvent.Type.Resize:
+            self._resize(obj)
+            return False
+        if not self.capturing:
+            return False
+        kind = MOUSE_KINDS.get(type_)
+        if kind is not None:
+            position = event.position()
+            self._append(
+                kind,
+                self._string(obj.objectName()),
+                round(position.x() * SUBPIXEL),
+                round(position.y() * SUBPIXEL),
+                event.button().value,
+                event.buttons().value,
+                event.modifiers().value,
+            )
+            return False
+        kind = KEY_KINDS.get(type_)
+        if kind is not None:
+            self._append(
+                kind,
+                self._string(obj.objectName()),
+                int(event.isAutoRepeat()),
+                0,
+                event.key(),
+                event.modifiers().value,
+                0,
+            )
+        return False
+
+    def _resize(self, window: QWindow):
+        self._append(
+            RESIZE,
+            self._string(window.objectName()),
+            window.width() * SUBPIXEL,
+            window.height() * SUBPIXEL,
+            0,
+            0,
+            0,
+        )
+
+    def _string(self, text: str) -> int:
+        index = self._strings.get(text)
+        if index is None:
+            index = self._strings[text] = len(self._strings)
+            data = text.encode()
+            self._buffer += RECORD.pack(
+                time.perf_counter_ns() - self._origin,
+                STRING,
+                0,
+                0,
+                0,
+                index,
+                len(data),
+                0,
+            )
+            self._buffer += data
+        return index
+
+    def _append(
+        self,
+        kind: int,
+        target: int,
+        x: int,
+        y: int,
+        a: int,
+        b: int,
+        c: int,
+        data: bytes = b"",
+    ):
+        self._buffer += RECORD.pack(
+            time.perf_counter_ns() - self._origin, kind, target, x, y, a, b, c
+        )
+        self._buffer += data
+        self.events += 1
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def _write_loop(self, file):
+        with file:
+            while True:
+                chunk = self._queue.get()
+                if chunk is None:
+                    break
+                if self.compress:
+                    chunk = zlib.compress(chunk, 1)
+                file.write(CHUNK.pack(self.compress, len(chunk)))
+                file.write(chunk)
+                file.flush()
+
+
+def read_session(path: Path) -> tuple[int, list[Record]]:
+    with Path(path).open("rb") as file:
+        magic, version, started_at = HEADER.unpack(file.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a session recording")
+        data = bytearray()
+        while header := file.read(CHUNK.size):
+            if len(header) < CHUNK.size:
+                break
+            compressed, length = CHUNK.unpack(header)
+            chunk = file.read(length)
+            if len(chunk) < length:
+                break
+            data += zlib.decompress(chunk) if compressed else chunk
+    strings = {}
+    records = []
+    offset = 0
+    while offset + RECORD.size <= len(data):
+        time_ns, kind, target, x, y, a, b, c = RECORD.unpack_from(data, offset)
+        offset += RECORD.size
+        if kind == STRING:
+            strings[a] = data[offset : offset + b].decode()
+            offset += b
+            continue
+        text = ""
+        if kind in MARKERS:
+            text = data[offset : offset + b].decode()
+            offset += b
+        records.append(
+            Record(
+                time_ns,
+                kind,
+                strings.get(target, "") if kind not in MARKERS else "",
+                x / SUBPIXEL,
+                y / SUBPIXEL,
+                a,
+                b,
+                c,
+                text,
+            )
+        )
+    return started_at, records
+
+
+class SessionReplayer(QObject):
+    finished = pyqtSignal()
+    marker = pyqtSignal(int, str)
+
+    def __init__(self, records: list[Record], speed: float = 1.0):
+        super().__init__()
+        self.records = records
+        self.speed = speed
+        self.lag_ms: list[float] = []
+        self._index = 0
+        self._started = 0
+        self._windows: dict[str, QWindow] = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._step)
+
+    @property
+    def duration(self) -> float:
+        return (time.perf_counter_ns() - self._started) / 1e9
+
+    def start(self):
+        self._index = 0
+        self.lag_ms.clear()
+        self._started = time.perf_counter_ns()
+        self._timer.start(0)
+
+    def stop(self):
+        self._timer.stop()
+
+    def _due_ns(self, record: Record) -> int:
+        return round(record.time_ns / self.speed) if self.speed > 0 else 0
+
+    def _step(self):
+        while self._index < len(self.records):
+            record = self.records[self._index]
+            wait_ns = self._due_ns(record) - (time.perf_counter_ns() - self._started)
+            if wait_ns > 0 and self.speed > 0:
+                self._timer.start(wait_ns // 1_000_000)
+                return
+            self._index += 1
+            self.lag_ms.append(-wait_ns / 1e6 if self.speed > 0 else 0.0)
+            self.dispatch(record)
+            if self.speed <= 0:
+                self._timer.start(0)
+                return
+        self.finished.emit()
+
+    def dispatch(self, record: Record):
+        if record.kind in MARKERS:
+            self.marker.emit(record.kind, record.text)
+            return
+        window = self._window(record.target)
+        if window is None:
+            return
+        if record.kind == RESIZE:
+            window.resize(round(record.x), round(record.y))
+            return
+        type_ = EVENT_TYPES[record.kind]
+        if type_ in MOUSE_KINDS:
+            position = QPointF(record.x, record.y)
+            event = QMouseEvent(
+                type_,
+                position,
+                QPointF(window.mapToGlobal(position.toPoint())),
+                Qt.MouseButton(record.a),
+                Qt.MouseButton(record.b),
+                Qt.KeyboardModifier(record.c),
+            )
+        else:
+            event = QKeyEvent(
+                type_,
+                record.a,
+                Qt.KeyboardModifier(record.b),
+                record.text,
+                bool(record.x),
+            )
+        QGuiApplication.sendEvent(window, event)
+
+    def _window(self, name: str) -> QWindow | None:
+        window = self._windows.get(name)
+        if window is None or not window.isVisible():
+            window = next(
+                (
+                    window
+                    for window in QGuiApplication.topLevelWindows()
+                    if window.objectName() == name and window.isVisible()
+                ),
+                None,
+            )
+            self._windows[name] = window
+        return window
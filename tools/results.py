@@ -0,0 +1,222 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trials (
+    id INTEGER PRIMARY KEY,
+    patient TEXT NOT NULL,
+    category TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    layout TEXT NOT NULL,
+    responses TEXT NOT NULL,
+    timings TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trials_patient ON trials (patient, category, started_at);
+CREATE INDEX IF NOT EXISTS trials_category ON trials (category, started_at);
+CREATE TABLE IF NOT EXISTS stats (
+    patient TEXT NOT NULL,
+    category TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (patient, category)
+) WITHOUT ROWID;
+"""
+LOGGER = logging.getLogger("neuronika.results")
+
+
+@dataclass
+class Trial:
+    patient: str
+    category: str
+    layout: list
+    responses: list
+    timings: dict
+    started_at: float = field(default_factory=time.time)
+
+    def row(self) -> tuple:
+        return (
+            self.patient,
+            self.category,
+            self.started_at,
+            json.dumps(self.layout, ensure_ascii=False),
+            json.dumps(self.responses, ensure_ascii=False),
+            json.dumps(self.timings, ensure_ascii=False),
+        )
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Trial":
+        patient, category, started_at, layout, responses, timings = row
+        return cls(
+            patient,
+            category,
+            json.loads(layout),
+            json.loads(responses),
+            json.loads(timings),
+            started_at,
+        )
+
+
+class ResultStore:
+    columns = "patient, category, started_at, layout, responses, timings"
+    retry_delay = 1.0
+    retry_attempts = 5
+
+    def __init__(self, path: Path, batch_size: int, flush_interval: float):
+        self.path = Path(path)
+        self.rejected_path = self.path.with_suffix(".rejected.jsonl")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.rejected = 0
+        self._queue = queue.Queue()
+        self._writer = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._prepared = False
+
+    def record(self, trial: Trial, stats: dict | None = None):
+        self._start()
+        self._queue.put((trial, stats))
+
+    def flush(self):
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    def trials(
+        self, patient: str, category: str | None = None, limit: int | None = None
+    ) -> list[Trial]:
+        if category is None:
+            return self._select("patient = ?", [patient], limit)
+        return self._select("patient = ? AND category = ?", [patient, category], limit)
+
+    def category_trials(self, category: str, limit: int | None = None) -> list[Trial]:
+        return self._select("category = ?", [category], limit)
+
+    def stats(self, patient: str, category: str) -> dict | None:
+        row = self._reader().execute(
+            "SELECT state FROM stats WHERE patient = ? AND category = ?",
+            (patient, category),
+        ).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def _select(self, where: str, params: list, limit: int | None) -> list[Trial]:
+        query = f"SELECT {self.columns} FROM trials WHERE {where} ORDER BY started_at DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [Trial.from_row(row) for row in self._reader().execute(query, params)]
+
+    def _connect(self) -> sqlite3.Connection:
+        with self._lock:
+            if not self._prepared:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                connection = sqlite3.connect(self.path, timeout=30)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.executescript(SCHEMA)
+                connection.close()
+                self._prepared = True
+        return sqlite3.connect(self.path, timeout=30)
+
+    def _reader(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = self._local.connection = self._connect()
+        return connection
+
+    def _start(self):
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._write_loop, name="ResultStore", daemon=True
+                )
+                self._writer.start()
+
+    def _write_loop(self):
+        connection = self._connect()
+        connection.execute("PRAGMA synchronous=FULL")
+        batch = []
+        attempts = 0
+        stopping = False
+        while not stopping or batch:
+            if not stopping:
+                stopping = self._collect(batch)
+            if not batch:
+                continue
+            try:
+                self._write(connection, batch)
+            except sqlite3.OperationalError as error:
+                attempts += 1
+                if attempts < self.retry_attempts and not stopping:
+                    time.sleep(self.retry_delay)
+                    continue
+                self._reject(batch, error)
+            except (sqlite3.Error, TypeError, ValueError):
+                for item in batch:
+                    try:
+                        self._write(connection, [item])
+                    except (sqlite3.Error, TypeError, ValueError) as error:
+                        self._reject([item], error)
+            attempts = 0
+            for _ in batch:
+                self._queue.task_done()
+            batch.clear()
+        connection.close()
+
+    def _write(self, connection: sqlite3.Connection, batch: list):
+        with connection:
+            connection.executemany(
+                f"INSERT INTO trials ({self.columns}) VALUES (?, ?, ?, ?, ?, ?)",
+                [trial.row() for trial, _ in batch],
+            )
+            connection.executemany(
+                "INSERT INTO stats (patient, category, state) VALUES (?, ?, ?) "
+                "ON CONFLICT (patient, category) "
+                "DO UPDATE SET state = excluded.state",
+                [
+                    (trial.patient, trial.category, json.dumps(stats))
+                    for trial, stats in batch
+                    if stats is not None
+                ],
+            )
+
+    def _reject(self, batch: list, error: Exception):
+        self.rejected += len(batch)
+        LOGGER.error(
+            "dropped %d trial(s), kept in %s: %s", len(batch), self.rejected_path, error
+        )
+        try:
+            with open(self.rejected_path, "a", encoding="utf-8") as file:
+                for trial, stats in batch:
+                    record = {"trial": asdict(trial), "stats": stats}
+                    record["error"] = str(error)
+                    file.write(json.dumps(record, ensure_ascii=False, default=repr))
+                    file.write("\n")
+        except OSError:
+            LOGGER.exception("could not write %s", self.rejected_path)
+
+    def _collect(self, batch: list) -> bool:
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                return False
+            if item is None:
+                self._queue.task_done()
+                return True
+            batch.append(item)
+        return False
@@ -0,0 +1,145 @@
+import time
+from collections.abc import Callable, Iterable
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtWidgets import (
+    QApplication,
+    QGraphicsPixmapItem,
+    QGraphicsView,
+    QLabel,
+    QStackedLayout,
+    QWidget,
+)
+
+from tools.startup import after_idle
+
+
+def page_pixmaps(page: QWidget) -> list[QPixmap | QImage]:
+    pixmaps = [label.pixmap() for label in page.findChildren(QLabel)]
+    for widget in (page, *page.findChildren(QWidget)):
+        cached_pixmaps = getattr(widget, "cached_pixmaps", None)
+        if cached_pixmaps is not None:
+            pixmaps.extend(cached_pixmaps())
+    for view in page.findChildren(QGraphicsView):
+        if view.scene() is not None:
+            pixmaps.extend(
+                item.pixmap()
+                for item in view.scene().items()
+                if isinstance(item, QGraphicsPixmapItem)
+            )
+    return [pixmap for pixmap in pixmaps if not pixmap.isNull()]
+
+
+def page_cost(page: QWidget) -> int:
+    return sum(
+        pixmap.width() * pixmap.height() * pixmap.depth() // 8
+        for pixmap in page_pixmaps(page)
+    )
+
+
+class PageRouter:
+    def __init__(
+        self,
+        stack: QStackedLayout,
+        idle_timeout: float,
+        memory_limit: int,
+        prefetch_delay: int,
+        sweep_interval: int,
+        pixmaps=None,
+    ):
+        self.stack = stack
+        self.idle_timeout = idle_timeout
+        self.memory_limit = memory_limit
+        self.prefetch_delay = prefetch_delay
+        self.sweep_interval = sweep_interval
+        self.pixmaps = pixmaps
+        self.current = None
+        self.observers: list[Callable[[str], None]] = []
+        self._factories: dict[str, Callable[[], QWidget]] = {}
+        self._hints: dict[str, tuple[str, ...]] = {}
+        self._pages: dict[str, QWidget] = {}
+        self._used: dict[str, float] = {}
+        self._scheduled = set()
+        self._sweeper = None
+
+    def register(
+        self, name: str, factory: Callable[[], QWidget], prefetch: Iterable[str] = ()
+    ):
+        self._factories[name] = factory
+        self._hints[name] = tuple(prefetch)
+
+    def is_built(self, name: str) -> bool:
+        return name in self._pages
+
+    def page(self, name: str) -> QWidget:
+        page = self._pages.get(name)
+        if page is None:
+            page = self._factories[name]()
+            self._pages[name] = page
+            self._used[name] = time.monotonic()
+            self.stack.addWidget(page)
+        return page
+
+    def show(self, name: str):
+        self.stack.setCurrentWidget(self.page(name))
+        self.current = name
+        self._used[name] = time.monotonic()
+        for observer in self.observers:
+            observer(name)
+        for hint in self._hints[name]:
+            self.prefetch(hint, self.prefetch_delay)
+        self._start_sweeper()
+
+    def prefetch(self, name: str, delay: int = 0):
+        if name in self._pages or name in self._scheduled:
+            return
+        self._scheduled.add(name)
+        after_idle(QApplication.instance(), delay, lambda: self._build_scheduled(name))
+
+    def evict(self, name: str):
+        if name == self.current or name not in self._pages:
+            return
+        page = self._pages.pop(name)
+        self._used.pop(name)
+        self.stack.removeWidget(page)
+        if self.pixmaps is not None:
+            shared = {
+                pixmap.cacheKey()
+                for other in self._pages.values()
+                for pixmap in page_pixmaps(other)
+            }
+            self.pixmaps.release(
+                pixmap
+                for pixmap in page_pixmaps(page)
+                if pixmap.cacheKey() not in shared
+            )
+        page.deleteLater()
+
+    def sweep(self):
+        now = time.monotonic()
+        for name in list(self._pages):
+            if name != self.current and now - self._used[name] > self.idle_timeout:
+                self.evict(name)
+
+        costs = {name: page_cost(page) for name, page in self._pages.items()}
+        idle = sorted(
+            (name for name in self._pages if name != self.current),
+            key=self._used.get,
+        )
+        total = sum(costs.values())
+        for name in idle:
+            if total <= self.memory_limit:
+                break
+            total -= costs[name]
+            self.evict(name)
+
+    def _build_scheduled(self, name: str):
+        self._scheduled.discard(name)
+        self.page(name)
+
+    def _start_sweeper(self):
+        if self._sweeper is None:
+            self._sweeper = QTimer()
+            self._sweeper.timeout.connect(self.sweep)
+            self._sweeper.start(self.sweep_interval)
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class Session:
+    login: str | None = None
+    category: str | None = None
+    level: int = 0
+    exposure_ms: float | None = None
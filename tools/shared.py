@@ -0,0 +1,244 @@
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from PyQt6.QtGui import QImage
+
+MAGIC = b"NRKC"
+VERSION = 1
+HEADER = struct.Struct("<4sIIQ")
+SLOT = struct.Struct("<16sdIIIQ")
+STATE = struct.Struct("<I")
+ALIGNMENT = 16
+IMAGE_FORMAT = QImage.Format.Format_ARGB32_Premultiplied
+READY = 1
+MAX_SIDE = 16384
+MAX_RATIO = 16.0
+
+
+@contextmanager
+def file_lock(fd: int):
+    if os.name == "nt":
+        import msvcrt
+
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    else:
+        import fcntl
+
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+class SharedImageCache:
+    slot_size = SLOT.size + STATE.size
+
+    def __init__(self, path: Path, capacity: int, slots: int, bundle=None):
+        self.path = Path(path)
+        self.bundle = bundle
+        self.slots = slots
+        self.hits = 0
+        self.misses = 0
+        self.published = 0
+        self._digests: dict[str, tuple[int, int, bytes]] = {}
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        binary = getattr(os, "O_BINARY", 0)
+        try:
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | binary, 0o644)
+            self.writable = True
+        except PermissionError:
+            self._fd = os.open(self.path, os.O_RDONLY | binary)
+            self.writable = False
+        try:
+            if self.writable:
+                with file_lock(self._fd):
+                    if os.fstat(self._fd).st_size == 0:
+                        os.truncate(self._fd, capacity)
+                        os.lseek(self._fd, 0, os.SEEK_SET)
+                        os.write(self._fd, HEADER.pack(MAGIC, VERSION, slots, 0))
+                self._map = mmap.mmap(self._fd, 0)
+            else:
+                self._map = mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ)
+            magic, version, self.slots, _ = HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path} is not a version {VERSION} image cache")
+            self.capacity = len(self._map)
+            self.data_start = HEADER.size + self.slots * self.slot_size
+            self.data_start += -self.data_start % ALIGNMENT
+            if not self.slots or self.data_start > self.capacity:
+                raise ValueError(f"{path} has a corrupted header")
+        except (OSError, ValueError, struct.error):
+            if hasattr(self, "_map"):
+                self._map.close()
+            os.close(self._fd)
+            raise
+
+    @classmethod
+    def open(
+        cls, path: Path, capacity: int, slots: int, bundle=None
+    ) -> "SharedImageCache | None":
+        try:
+            return cls(path, capacity, slots, bundle)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def digest(self, file_name: str) -> bytes | None:
+        source = self.bundle.source_id(file_name) if self.bundle is not None else None
+        if source is not None:
+            return source
+        try:
+            stat = os.stat(file_name)
+        except OSError:
+            return None
+        cached = self._digests.get(file_name)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+        try:
+            with open(file_name, "rb") as file:
+                digest = hashlib.file_digest(file, "blake2b").digest()[:16]
+        except OSError:
+            return None
+        self._digests[file_name] = stat.st_mtime_ns, stat.st_size, digest
+        return digest
+
+    def key(
+        self, file_name: str, size: int | None, ratio: float, keep_aspect: bool
+    ) -> bytes | None:
+        digest = self.digest(file_name)
+        if digest is None:
+            return None
+        return hashlib.blake2b(
+            f"{size}:{ratio}:{keep_aspect:d}".encode() + digest, digest_size=16
+        ).digest()
+
+    def image(
+        self, file_name: str, size: int | None, ratio: float, keep_aspect: bool
+    ) -> QImage | None:
+        key = self.key(file_name, size, ratio, keep_aspect)
+        if key is None:
+            return None
+        slot = self._find(key)
+        if slot is None or not self._ready(slot):
+            self.misses += 1
+            return None
+        _, ratio, width, height, bytes_per_line, offset = SLOT.unpack_from(
+            self._map, self._slot_offset(slot)
+        )
+        if not self._valid(ratio, width, height, bytes_per_line, offset):
+            self.misses += 1
+            return None
+        self.hits += 1
+        image = QImage(
+            memoryview(self._map)[offset : offset + bytes_per_line * height],
+            width,
+            height,
+            bytes_per_line,
+            IMAGE_FORMAT,
+        )
+        image.setDevicePixelRatio(ratio)
+        return image
+
+    def publish(
+        self,
+        file_name: str,
+        size: int | None,
+        ratio: float,
+        keep_aspect: bool,
+        image: QImage,
+    ) -> bool:
+        if not self.writable or image.isNull():
+            return False
+        key = self.key(file_name, size, ratio, keep_aspect)
+        if key is None:
+            return False
+        image = image.convertToFormat(IMAGE_FORMAT)
+        length = image.bytesPerLine() * image.height()
+        try:
+            with self._lock, file_lock(self._fd):
+                slot = self._find(key)
+                if slot is None:
+                    return False
+                if self._ready(slot):
+                    return True
+                magic, version, slots, used = HEADER.unpack_from(self._map)
+                offset = self.data_start + used
+                if offset + length > self.capacity:
+                    return False
+                self._map[offset : offset + length] = image.constBits().asstring(length)
+                SLOT.pack_into(
+                    self._map,
+                    self._slot_offset(slot),
+                    key,
+                    image.devicePixelRatio(),
+                    image.width(),
+                    image.height(),
+                    image.bytesPerLine(),
+                    offset,
+                )
+                STATE.pack_into(self._map, self._slot_offset(slot) + SLOT.size, READY)
+                used += length + -length % ALIGNMENT
+                HEADER.pack_into(self._map, 0, magic, version, slots, used)
+        except OSError:
+            return False
+        self.published += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "published": self.published,
+            "used": HEADER.unpack_from(self._map)[3],
+            "capacity": self.capacity - self.data_start,
+        }
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+    def _valid(
+        self, ratio: float, width: int, height: int, bytes_per_line: int, offset: int
+    ) -> bool:
+        return (
+            math.isfinite(ratio)
+            and 0 < ratio <= MAX_RATIO
+            and 0 < width <= MAX_SIDE
+            and 0 < height <= MAX_SIDE
+            and width * 4 <= bytes_per_line <= MAX_SIDE * 4
+            and bytes_per_line % 4 == 0
+            and offset >= self.data_start
+            and offset % ALIGNMENT == 0
+            and offset + bytes_per_line * height <= self.capacity
+        )
+
+    def _slot_offset(self, slot: int) -> int:
+        return HEADER.size + slot * self.slot_size
+
+    def _ready(self, slot: int) -> bool:
+        offset = self._slot_offset(slot) + SLOT.size
+        return STATE.unpack_from(self._map, offset)[0] == READY
+
+    def _find(self, key: bytes) -> int | None:
+        start = int.from_bytes(key[:8], "little") % self.slots
+        for probe in range(self.slots):
+            slot = (start + probe) % self.slots
+            if not self._ready(slot):
+                return slot
+            offset = self._slot_offset(slot)
+            if self._map[offset : offset + len(key)] == key:
+                return slot
+        return None
@@ -0,0 +1,69 @@
+import importlib
+from collections.abc import Callable, Iterable
+
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QWidget
+
+
+class FirstPaint(QObject):
+    def __init__(self, widget: QWidget, callback: Callable[[], None]):
+        super().__init__(widget)
+        self.callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            obj.removeEventFilter(self)
+            self.callback()
+        return False
+
+
+def after_first_paint(widget: QWidget, callback: Callable[[], None]) -> FirstPaint:
+    return FirstPaint(widget, callback)
+
+
+class Idle(QObject):
+    input_events = frozenset(
+        (
+            QEvent.Type.KeyPress,
+            QEvent.Type.MouseButtonPress,
+            QEvent.Type.MouseMove,
+            QEvent.Type.Wheel,
+        )
+    )
+
+    def __init__(self, app: QObject, delay: int, callback: Callable[[], None]):
+        super().__init__(app)
+        self.app = app
+        self.callback = callback
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self._fire)
+        app.installEventFilter(self)
+        self.timer.start()
+
+    def eventFilter(self, obj, event):
+        if event.type() in self.input_events:
+            self.timer.start()
+        return False
+
+    def _fire(self):
+        self.app.removeEventFilter(self)
+        self.deleteLater()
+        self.callback()
+
+
+def after_idle(app: QObject, delay: int, callback: Callable[[], None]) -> Idle:
+    return Idle(app, delay, callback)
+
+
+def warm_imports(modules: Iterable[str]) -> list[str]:
+    loaded = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        loaded.append(name)
+    return loaded
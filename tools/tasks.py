@@ -0,0 +1,39 @@
+from collections.abc import Callable
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class TaskSignals(QObject):
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(Exception)
+
+
+class Task(QRunnable):
+    def __init__(self, func: Callable, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.signals = TaskSignals()
+
+    def run(self):
+        try:
+            result = self.func(*self.args)
+        except Exception as error:
+            self.signals.failed.emit(error)
+        else:
+            self.signals.finished.emit(result)
+
+
+def run_in_background(
+    func: Callable,
+    *args,
+    on_finished: Callable | None = None,
+    on_failed: Callable | None = None,
+) -> Task:
+    task = Task(func, *args)
+    if on_finished is not None:
+        task.signals.finished.connect(on_finished)
+    if on_failed is not None:
+        task.signals.failed.connect(on_failed)
+    QThreadPool.globalInstance().start(task)
+    return task
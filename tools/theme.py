@@ -0,0 +1,86 @@
+from string import Template
+
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtWidgets import QApplication
+
+THEMES = {
+    "default": {
+        "left_panel_color": "#446c7c",
+        "right_panel_color": "#365b66",
+        "header_color": "#446c7c",
+        "panel_text_color": "white",
+        "user_name_color": "#8c7c44",
+        "label_color": "#bfaca3",
+        "page_color": "white",
+        "info_background_color": "#ececf4",
+        "button_color": "#499477",
+        "button_text_color": "white",
+        "border_color": "black",
+    },
+    "light": {
+        "left_panel_color": "#9fc4d0",
+        "right_panel_color": "#b7d3dc",
+        "header_color": "#2f5563",
+        "panel_text_color": "#102a33",
+        "user_name_color": "#5c4d1c",
+        "label_color": "#5a4a43",
+        "page_color": "white",
+        "info_background_color": "#f4f4f8",
+        "button_color": "#2e6b53",
+        "button_text_color": "white",
+        "border_color": "#333333",
+    },
+}
+
+STYLESHEET = Template(
+    """
+QLabel#TextureHeader {
+    font-size: 25px;
+    color: $header_color;
+}
+#MainBlock, #MainBlock * {
+    background-color: $page_color;
+}
+QGraphicsView#MenuTiles {
+    border: none;
+}
+#QuestPanel, #QuestPanel *, #HelpPage, #HelpPage * {
+    background-color: $page_color;
+}
+GridBoard#QuestBoard {
+    color: $border_color;
+}
+QPushButton#BackButton {
+    border: none;
+}
+QPushButton#ContinueButton {
+    background-color: $button_color;
+    color: $button_text_color;
+}
+"""
+)
+
+
+class Theme(QObject):
+    changed = pyqtSignal()
+
+    def __init__(self, name: str, themes: dict = THEMES):
+        super().__init__()
+        self.name = name
+        self.themes = themes
+
+    @property
+    def colors(self) -> dict[str, str]:
+        return self.themes[self.name]
+
+    def color(self, role: str) -> str:
+        return self.colors[role]
+
+    def compile(self, name: str) -> str:
+        return STYLESHEET.substitute(self.themes[name])
+
+    def apply(self, name: str | None = None):
+        name = name or self.name
+        QApplication.instance().setStyleSheet(self.compile(name))
+        self.name = name
+        self.changed.emit()
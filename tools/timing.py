@@ -0,0 +1,193 @@
+import time
+from array import array
+from collections import deque
+from typing import NamedTuple
+
+from PyQt6.QtCore import QEvent, QObject, QPointF, Qt
+from PyQt6.QtGui import QKeyEvent, QMouseEvent
+from PyQt6.QtWidgets import QApplication, QWidget
+
+NO_STIMULUS = -1
+
+
+class Sample(NamedTuple):
+    kind: int
+    stimulus_ns: int
+    event_ns: int
+    delivered_ns: int
+    latency_ns: int
+
+    @property
+    def queue_delay_ns(self) -> int:
+        return self.delivered_ns - self.event_ns
+
+
+class SampleBuffer:
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._columns = [array("q", bytes(8 * capacity)) for _ in Sample._fields]
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, index: int) -> Sample:
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        return self._sample((self._start + index) % self.capacity)
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield self._sample((self._start + index) % self.capacity)
+
+    def __reversed__(self):
+        for index in range(self._size - 1, -1, -1):
+            yield self._sample((self._start + index) % self.capacity)
+
+    def append(self, sample: Sample):
+        position = (self._start + self._size) % self.capacity
+        for column, value in zip(self._columns, sample):
+            column[position] = value
+        if self._size < self.capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+
+    def find_last(self, kind: int) -> Sample | None:
+        kinds = self._columns[0]
+        for index in range(self._size - 1, -1, -1):
+            position = (self._start + index) % self.capacity
+            if kinds[position] == kind:
+                return self._sample(position)
+        return None
+
+    def latencies_ms(self) -> list[float]:
+        return [
+            sample.latency_ns / 1e6
+            for sample in self
+            if sample.latency_ns != NO_STIMULUS
+        ]
+
+    def _sample(self, position: int) -> Sample:
+        return Sample(*(column[position] for column in self._columns))
+
+
+class InputClock(QObject):
+    kinds = {
+        QEvent.Type.MouseButtonPress: 0,
+        QEvent.Type.MouseButtonRelease: 1,
+        QEvent.Type.KeyPress: 2,
+        QEvent.Type.KeyRelease: 3,
+    }
+    offset_window = 64
+    wrap_ms = 1 << 31
+
+    def __init__(self, history: int = 1024):
+        super().__init__()
+        self.samples = SampleBuffer(history)
+        self.stimulus_ns = NO_STIMULUS
+        self._offsets = deque(maxlen=self.offset_window)
+        self._last = None
+        self._last_timestamp = 0
+
+    def mark_stimulus(self, onset_ns: int | None = None):
+        self.stimulus_ns = time.perf_counter_ns() if onset_ns is None else onset_ns
+
+    def clear_stimulus(self):
+        self.stimulus_ns = NO_STIMULUS
+
+    def last(self, kind: QEvent.Type) -> Sample | None:
+        return self.samples.find_last(self.kinds[kind])
+
+    @staticmethod
+    def timestamp_ms(event) -> int:
+        return event.timestamp()
+
+    def event_time_ns(self, timestamp_ms: int, delivered_ns: int) -> int:
+        if timestamp_ms == 0:
+            return delivered_ns
+        if timestamp_ms < self._last_timestamp - self.wrap_ms:
+            self._offsets.clear()
+        self._last_timestamp = timestamp_ms
+        self._offsets.append(delivered_ns - timestamp_ms * 1_000_000)
+        return timestamp_ms * 1_000_000 + min(self._offsets)
+
+    def eventFilter(self, obj, event):
+        kind = self.kinds.get(event.type())
+        if kind is None:
+            return False
+        delivered_ns = time.perf_counter_ns()
+        timestamp_ms = self.timestamp_ms(event)
+        if timestamp_ms == 0 or self._last != (kind, timestamp_ms):
+            self._last = kind, timestamp_ms
+            event_ns = self.event_time_ns(timestamp_ms, delivered_ns)
+            latency_ns = NO_STIMULUS
+            if self.stimulus_ns != NO_STIMULUS:
+                latency_ns = max(0, event_ns - self.stimulus_ns)
+            self.samples.append(
+                Sample(kind, self.stimulus_ns, event_ns, delivered_ns, latency_ns)
+            )
+        return False
+
+
+class SyntheticClock(InputClock):
+    def __init__(self):
+        super().__init__()
+        self.timestamps = {}
+
+    def timestamp_ms(self, event) -> int:
+        return self.timestamps[id(event)]
+
+
+def self_test(
+    app: QApplication, count: int = 200, warmup: int = 10, max_delay_ms: float = 8.0
+) -> dict:
+    import random
+    import statistics
+
+    clock = SyntheticClock()
+    target = QWidget()
+    target.installEventFilter(clock)
+    errors = []
+    rng = random.Random(0)
+    for index in range(warmup + count):
+        created_ns = time.perf_counter_ns()
+        clock.mark_stimulus(created_ns - rng.randrange(100, 900) * 1_000_000)
+        if index % 2:
+            event = QKeyEvent(
+                QEvent.Type.KeyPress, Qt.Key.Key_Space, Qt.KeyboardModifier.NoModifier
+            )
+        else:
+            event = QMouseEvent(
+                QEvent.Type.MouseButtonPress,
+                QPointF(1, 1),
+                QPointF(1, 1),
+                Qt.MouseButton.LeftButton,
+                Qt.MouseButton.LeftButton,
+                Qt.KeyboardModifier.NoModifier,
+            )
+        clock.timestamps[id(event)] = created_ns // 1_000_000
+        delay_end = time.perf_counter_ns() + rng.random() * max_delay_ms * 1_000_000
+        while time.perf_counter_ns() < delay_end:
+            pass
+        app.sendEvent(target, event)
+        sample = clock.samples[-1]
+        del clock.timestamps[id(event)]
+        if index >= warmup:
+            errors.append((sample.event_ns - created_ns) / 1e6)
+    target.removeEventFilter(clock)
+    jitter = [abs(error) for error in errors]
+    return {
+        "samples": count,
+        "mean_error_ms": statistics.fmean(errors),
+        "stdev_ms": statistics.pstdev(errors),
+        "max_abs_error_ms": max(jitter),
+        "p95_abs_error_ms": statistics.quantiles(jitter, n=20)[-1],
+    }
@@ -0,0 +1,164 @@
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from functools import wraps
+from pathlib import Path
+
+TRACE_FLAG = "--trace-startup"
+
+
+class Tracer:
+    categories = ("import", "app", "init", "image", "paint")
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self.origin = time.perf_counter_ns()
+        self.events = []
+        self._local = threading.local()
+        self._import = builtins.__import__
+        if enabled:
+            builtins.__import__ = self._traced_import
+
+    def now(self) -> float:
+        return (time.perf_counter_ns() - self.origin) / 1000
+
+    @contextmanager
+    def span(self, name: str, category: str):
+        args = {}
+        if not self.enabled:
+            yield args
+            return
+        start = self.now()
+        try:
+            yield args
+        finally:
+            self._add(name, category, "X", start, self.now() - start, args)
+
+    def instant(self, name: str, category: str):
+        if self.enabled:
+            self._add(name, category, "i", self.now())
+
+    def traced(self, cls: type) -> type:
+        if not self.enabled:
+            return cls
+        init = cls.__init__
+
+        @wraps(init)
+        def traced_init(instance, *args, **kwargs):
+            with self.span(cls.__name__, "init"):
+                init(instance, *args, **kwargs)
+
+        cls.__init__ = traced_init
+        return cls
+
+    def watch_first_frame(self, widget, on_frame: Callable[[], None]):
+        if not self.enabled:
+            return
+        from PyQt6.QtCore import QEvent, QObject
+
+        tracer = self
+
+        class FirstFrame(QObject):
+            events = {
+                QEvent.Type.Show: "show",
+                QEvent.Type.Expose: "expose",
+                QEvent.Type.Paint: "first paint",
+            }
+
+            def eventFilter(self, obj, event):
+                name = self.events.get(event.type())
+                if name is not None and name not in self.seen:
+                    self.seen.add(name)
+                    tracer.instant(name, "paint")
+                    if name == "show" and widget.windowHandle() is not None:
+                        widget.windowHandle().installEventFilter(self)
+                    elif name == "first paint":
+                        widget.removeEventFilter(self)
+                        if widget.windowHandle() is not None:
+                            widget.windowHandle().removeEventFilter(self)
+                        on_frame()
+                return False
+
+        watcher = FirstFrame(widget)
+        watcher.seen = set()
+        widget.installEventFilter(watcher)
+
+    def finish(self, path: Path):
+        if not self.enabled:
+            return
+        builtins.__import__ = self._import
+        self.enabled = False
+        self.write(path)
+        print(self.summary())
+
+    def write(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({"traceEvents": self.events, "displayTimeUnit": "ms"}))
+
+    def summary(self) -> str:
+        phases = {}
+        first_paint = None
+        for event in self.events:
+            if event["ph"] == "i":
+                if event["name"] == "first paint" and first_paint is None:
+                    first_paint = event["ts"]
+                continue
+            key = event["cat"], event["name"]
+            calls, total = phases.get(key, (0, 0.0))
+            phases[key] = calls + 1, total + event["dur"]
+
+        rows = sorted(
+            phases.items(),
+            key=lambda item: (self.categories.index(item[0][0]), -item[1][1]),
+        )
+        width = max([len(name) for _, name in phases] + [len("phase")])
+        lines = [f"{'category':<8}  {'phase':<{width}}  {'calls':>5}  {'total ms':>9}"]
+        for (category, name), (calls, total) in rows:
+            lines.append(f"{category:<8}  {name:<{width}}  {calls:>5}  {total / 1000:>9.1f}")
+        if first_paint is not None:
+            lines.append(f"time to first paint: {first_paint / 1000:.1f} ms")
+        return "\n".join(lines)
+
+    def _add(
+        self,
+        name: str,
+        category: str,
+        phase: str,
+        start: float,
+        duration: float = 0.0,
+        args: dict | None = None,
+    ):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": phase,
+            "ts": start,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if phase == "X":
+            event["dur"] = duration
+        else:
+            event["s"] = "p"
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def _traced_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules or getattr(self._local, "importing", False):
+            return self._import(name, globals, locals, fromlist, level)
+        self._local.importing = True
+        try:
+            with self.span(f"import {name}", "import"):
+                return self._import(name, globals, locals, fromlist, level)
+        finally:
+            self._local.importing = False
+
+
+TRACER = Tracer(any(arg.partition("=")[0] == TRACE_FLAG for arg in sys.argv))
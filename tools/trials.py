@@ -0,0 +1,240 @@
+import logging
+import threading
+from collections import deque
+from collections.abc import Sequence
+from typing import NamedTuple
+
+LOGGER = logging.getLogger("neuronika.trials")
+
+
+class Level(NamedTuple):
+    size: int
+    icons: int
+    spacing: int
+
+
+class Layout(NamedTuple):
+    level: int
+    index: int
+    size: int
+    cells: dict[tuple[int, int], str]
+
+
+class TrialGenerator:
+    max_attempts = 64
+
+    def __init__(
+        self,
+        icons: Sequence[str],
+        levels: Sequence[Level],
+        level: int,
+        seed: int,
+        history: int,
+        max_overlap: float,
+        batch: int,
+    ):
+        import numpy as np
+
+        self.icons = tuple(icons)
+        self.level = level
+        self.size, self.count, self.spacing = levels[level]
+        if self.count > self.size**2:
+            raise ValueError(
+                f"{self.count} icons do not fit a {self.size}x{self.size} board"
+            )
+        self.max_overlap = max_overlap
+        self.batch = batch
+        self.generated = 0
+        self._rng = np.random.default_rng([seed, level])
+        self._recent = deque(maxlen=history)
+        self._candidates = deque()
+        self._rows, self._cols = np.divmod(np.arange(self.size**2), self.size)
+
+    def place(self):
+        import numpy as np
+
+        cells = self.size**2
+        available = np.ones((self.batch, cells), dtype=bool)
+        valid = np.ones(self.batch, dtype=bool)
+        positions = np.empty((self.batch, self.count), dtype=np.intp)
+        batch = np.arange(self.batch)
+        for index in range(self.count):
+            scores = np.where(available, self._rng.random((self.batch, cells)), -1.0)
+            choice = scores.argmax(axis=1)
+            valid &= available[batch, choice]
+            positions[:, index] = choice
+            available &= (
+                np.abs(self._rows[choice][:, None] - self._rows) >= self.spacing
+            ) | (np.abs(self._cols[choice][:, None] - self._cols) >= self.spacing)
+        return positions[valid]
+
+    def choose_icons(self, batch: int):
+        pool = len(self.icons)
+        if self.count <= pool:
+            return self._rng.random((batch, pool)).argsort(axis=1)[:, : self.count]
+        return self._rng.integers(pool, size=(batch, self.count))
+
+    def overlap(self, codes):
+        import numpy as np
+
+        if not self._recent:
+            return np.zeros(codes.shape[:-1])
+        return np.isin(codes, np.concatenate(self._recent)).mean(axis=-1)
+
+    def refill(self):
+        positions = self.place()
+        codes = positions * len(self.icons) + self.choose_icons(len(positions))
+        self._candidates.extend(codes[self.overlap(codes) <= self.max_overlap])
+
+    def next(self) -> Layout:
+        for _ in range(self.max_attempts):
+            while self._candidates:
+                codes = self._candidates.popleft()
+                if self.overlap(codes) <= self.max_overlap:
+                    return self._accept(codes)
+            self.refill()
+        return self._accept(self._relaxed())
+
+    def _relaxed(self):
+        positions = self.place()
+        while not len(positions):
+            self.spacing -= 1
+            LOGGER.warning(
+                "level %d: no layout keeps %d icons apart on a %dx%d board, "
+                "spacing lowered to %d",
+                self.level,
+                self.count,
+                self.size,
+                self.size,
+                self.spacing,
+            )
+            positions = self.place()
+        codes = positions * len(self.icons) + self.choose_icons(len(positions))
+        LOGGER.info("level %d: overlap limit relaxed for one layout", self.level)
+        return codes[self.overlap(codes).argmin()]
+
+    def _accept(self, codes) -> Layout:
+        self._recent.append(codes)
+        self.generated += 1
+        positions, icons = divmod(codes, len(self.icons))
+        rows, cols = divmod(positions, self.size)
+        return Layout(
+            self.level,
+            self.generated,
+            self.size,
+            {
+                (int(row), int(col)): self.icons[icon]
+                for row, col, icon in zip(rows, cols, icons)
+            },
+        )
+
+
+class TrialPool:
+    def __init__(
+        self,
+        icons: Sequence[str],
+        levels: Sequence[Level],
+        seed: int,
+        pool_size: int,
+        history: int,
+        max_overlap: float,
+        batch: int,
+    ):
+        self.icons = icons
+        self.levels = levels
+        self.pool_size = pool_size
+        self.history = history
+        self.max_overlap = max_overlap
+        self.batch = batch
+        self._locks = [threading.Lock() for _ in levels]
+        self._ready = [deque() for _ in levels]
+        self._waiting = set()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self.reseed(seed)
+
+    def reseed(self, seed: int):
+        with self._condition:
+            self.seed = seed
+            self.generators: list[TrialGenerator | None] = [None] * len(self.levels)
+            for ready in self._ready:
+                ready.clear()
+
+    def generate(self, level: int, if_empty: bool = False):
+        with self._locks[level]:
+            with self._condition:
+                if if_empty and self._ready[level]:
+                    return
+                generators, seed = self.generators, self.seed
+            generator = generators[level]
+            if generator is None:
+                generator = generators[level] = TrialGenerator(
+                    self.icons,
+                    self.levels,
+                    level,
+                    seed,
+                    self.history,
+                    self.max_overlap,
+                    self.batch,
+                )
+            layout = generator.next()
+            with self._condition:
+                if generators is self.generators:
+                    self._ready[level].append(layout)
+                    self._waiting.discard(level)
+                    self._condition.notify_all()
+
+    def ready(self, level: int) -> int:
+        with self._condition:
+            return len(self._ready[level])
+
+    def take(self, level: int, timeout: float | None = None) -> Layout:
+        with self._condition:
+            self._start()
+            if not self._ready[level]:
+                self._waiting.add(level)
+                self._condition.notify_all()
+                self._condition.wait_for(lambda: self._ready[level], timeout)
+        while True:
+            with self._condition:
+                if self._ready[level]:
+                    layout = self._ready[level].popleft()
+                    self._condition.notify_all()
+                    return layout
+            self.generate(level, if_empty=True)
+
+    def start(self):
+        with self._condition:
+            self._start()
+
+    def stop(self):
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(
+                target=self._fill_loop, name="trials", daemon=True
+            )
+            self._thread.start()
+
+    def _next_level(self) -> int | None:
+        if self._waiting:
+            return min(self._waiting)
+        level = min(range(len(self._ready)), key=lambda level: len(self._ready[level]))
+        return level if len(self._ready[level]) < self.pool_size else None
+
+    def _fill_loop(self):
+        while True:
+            with self._condition:
+                while not self._stopping and (level := self._next_level()) is None:
+                    self._condition.wait()
+                if self._stopping:
+                    return
+            self.generate(level)
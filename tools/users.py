@@ -0,0 +1,102 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+from tools import PasswordManager
+
+VERSION = 1
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    login TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class UserStore:
+    def __init__(self, path: Path, defaults: dict[str, str], legacy: Path | None = None):
+        self.path = Path(path)
+        self.defaults = defaults
+        self.legacy = legacy
+        self._local = threading.local()
+        self._migration_lock = threading.Lock()
+        self._migrated = False
+
+    def get(self, login: str) -> str | None:
+        row = self._connection().execute(
+            "SELECT hash FROM users WHERE login = ?", (login,)
+        ).fetchone()
+        return row[0] if row is not None else None
+
+    def set(self, login: str, hash_: str):
+        with self._connection() as connection:
+            connection.execute(
+                "INSERT INTO users (login, hash) VALUES (?, ?) "
+                "ON CONFLICT (login) DO UPDATE SET hash = excluded.hash",
+                (login, hash_),
+            )
+
+    def add(self, login: str, password: str):
+        self.set(login, PasswordManager.gen_hash(password))
+
+    def remove(self, login: str) -> bool:
+        with self._connection() as connection:
+            cursor = connection.execute("DELETE FROM users WHERE login = ?", (login,))
+        return cursor.rowcount > 0
+
+    def __contains__(self, login: str) -> bool:
+        return self.get(login) is not None
+
+    def authenticate(self, login: str, password: str) -> bool:
+        hash_ = self.get(login)
+        if hash_ is None:
+            return False
+        verified, new_hash = PasswordManager.verify_and_update(password, hash_)
+        if new_hash is not None:
+            self.set(login, new_hash)
+        return verified
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._migrate(connection)
+            self._local.connection = connection
+        return connection
+
+    def _migrate(self, connection: sqlite3.Connection):
+        with self._migration_lock:
+            if self._migrated:
+                return
+            migrated_legacy = False
+            with connection:
+                connection.execute("BEGIN IMMEDIATE")
+                if connection.execute("PRAGMA user_version").fetchone()[0] < VERSION:
+                    connection.execute(SCHEMA)
+                    hashes = dict(self.defaults)
+                    legacy = self._read_legacy()
+                    if legacy is not None:
+                        hashes.update(legacy)
+                        migrated_legacy = True
+                    connection.executemany(
+                        "INSERT OR IGNORE INTO users (login, hash) VALUES (?, ?)",
+                        hashes.items(),
+                    )
+                    connection.execute(f"PRAGMA user_version = {VERSION}")
+            if migrated_legacy:
+                try:
+                    self.legacy.rename(self.legacy.with_suffix(".migrated"))
+                except OSError:
+                    pass
+            self._migrated = True
+
+    def _read_legacy(self) -> dict[str, str] | None:
+        if self.legacy is None:
+            return None
+        try:
+            return json.loads(self.legacy.read_text())
+        except (OSError, ValueError):
+            return None
@@ -0,0 +1,155 @@
+import logging
+import sys
+import threading
+import time
+import traceback
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+
+Stack = tuple[tuple[str, int, str], ...]
+
+
+class Stall:
+    def __init__(self, stack: Stack):
+        self.stack = stack
+        self.count = 0
+        self.total = 0.0
+        self.longest = 0.0
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+        self.longest = max(self.longest, duration)
+
+
+class Watchdog(QObject):
+    def __init__(
+        self,
+        threshold: float,
+        heartbeat: int,
+        log_path: Path,
+        max_bytes: int,
+        backup_count: int,
+    ):
+        super().__init__()
+        self.threshold = threshold
+        self.stalls: dict[Stack, Stall] = {}
+        self.logger = logging.getLogger("neuronika.watchdog")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.log_path = Path(log_path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._beat = time.monotonic()
+        self._main_thread = threading.main_thread().ident
+        self._stopping = threading.Event()
+        self._thread = None
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._timer.setInterval(heartbeat)
+        self.heartbeat = heartbeat / 1000
+        self._timer.timeout.connect(self.beat)
+
+    def beat(self):
+        self._beat = time.monotonic()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        if not self.logger.handlers:
+            self.log_path.parent.mkdir(parents=True, exist_ok=True)
+            handler = RotatingFileHandler(
+                self.log_path,
+                maxBytes=self.max_bytes,
+                backupCount=self.backup_count,
+                encoding="utf-8",
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.logger.addHandler(handler)
+        self.beat()
+        self._timer.start()
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._monitor, name="watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._timer.stop()
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        self.summary()
+
+    def capture(self) -> Stack | None:
+        frame = sys._current_frames().get(self._main_thread)
+        if frame is None:
+            return None
+        return tuple(
+            (entry.filename, entry.lineno, entry.name)
+            for entry in traceback.extract_stack(frame)
+        )
+
+    def record(self, stack: Stack, duration: float):
+        stall = self.stalls.get(stack)
+        if stall is None:
+            stall = self.stalls[stack] = Stall(stack)
+        stall.add(duration)
+        self.logger.warning(
+            "stall %.3fs at %s (seen %d times, total %.3fs, longest %.3fs)",
+            duration,
+            self.location(stack),
+            stall.count,
+            stall.total,
+            stall.longest,
+        )
+        if stall.count == 1:
+            self.logger.warning("%s", self.format(stack))
+
+    def summary(self):
+        for stall in sorted(self.stalls.values(), key=lambda s: s.total, reverse=True):
+            self.logger.info(
+                "summary %s: %d stalls, total %.3fs, longest %.3fs",
+                self.location(stall.stack),
+                stall.count,
+                stall.total,
+                stall.longest,
+            )
+
+    @staticmethod
+    def location(stack: Stack) -> str:
+        if not stack:
+            return "<unknown>"
+        filename, lineno, name = stack[-1]
+        return f"{Path(filename).name}:{lineno} {name}"
+
+    @staticmethod
+    def format(stack: Stack) -> str:
+        return "".join(
+            f'  File "{filename}", line {lineno}, in {name}\n'
+            for filename, lineno, name in stack
+        ).rstrip()
+
+    def _monitor(self):
+        poll = self.threshold / 4
+        stack = None
+        stalled_at = None
+        while not self._stopping.wait(poll):
+            beat = self._beat
+            blocked = time.monotonic() - beat
+            if blocked > self.threshold + self.heartbeat:
+                if stack is None:
+                    stack = self.capture() or ()
+                    stalled_at = beat
+                    self.logger.warning(
+                        "event loop blocked for %.3fs at %s",
+                        blocked,
+                        self.location(stack),
+                    )
+            elif stack is not None:
+                self.record(stack, beat - stalled_at)
+                stack = None